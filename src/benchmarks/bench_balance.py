@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency, kruskal
+
+from data_loader import load_experiment_data
+from thesis.modeling import balance_table
+
+NUMERIC_COVARIATES = ["age", "ai_literacy_sk9", "ai_literacy_sk10", "ai_literacy_ail2", "ai_literacy_ue2", "risk_aversion"]
+CATEGORICAL_COVARIATES = ["gender", "education", "domain_experience"]
+
+
+def test_loop(df: pd.DataFrame, numeric_cols: list[str], categorical_cols: list[str]) -> pd.DataFrame:
+    """One filter and scipy call per covariate, as in the 6_1 script."""
+    rows = []
+    for var in numeric_cols:
+        groups = [df[df["condition"] == cond][var].dropna() for cond in ["C1", "C2", "C3"]]
+        rows.append((var, *kruskal(*groups)))
+    for var in categorical_cols:
+        chi2, p, _, _ = chi2_contingency(pd.crosstab(df[var], df["condition"]))
+        rows.append((var, chi2, p))
+    return pd.DataFrame(rows, columns=["variable", "statistic", "p_value"])
+
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    n_copies = 50
+
+    data = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    conditions = data.main_trials.groupby("participant_code")["condition"].first().reset_index()
+    control_measures_df = data.control_measures.merge(conditions, on="participant_code")
+
+    # widen the covariate set with noisy copies to see how both scale
+    rng = np.random.default_rng(0)
+    copies = {}
+    for i in range(n_copies):
+        for var in NUMERIC_COVARIATES:
+            copies[f"{var}_{i}"] = control_measures_df[var] + rng.integers(-1, 2, len(control_measures_df))
+        for var in CATEGORICAL_COVARIATES:
+            copies[f"{var}_{i}"] = rng.permutation(control_measures_df[var].to_numpy())
+    wide_df = pd.concat([control_measures_df, pd.DataFrame(copies)], axis=1)
+    numeric_cols = NUMERIC_COVARIATES + [f"{var}_{i}" for i in range(n_copies) for var in NUMERIC_COVARIATES]
+    categorical_cols = CATEGORICAL_COVARIATES + [f"{var}_{i}" for i in range(n_copies) for var in CATEGORICAL_COVARIATES]
+
+    for label, df, num, cat in [
+        ("chapter", control_measures_df, NUMERIC_COVARIATES, CATEGORICAL_COVARIATES),
+        (f"{len(numeric_cols) + len(categorical_cols)} covariates", wide_df, numeric_cols, categorical_cols),
+    ]:
+        print(f"=== Balance tests, {label} ===")
+        start = time.perf_counter()
+        loop = test_loop(df, num, cat)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = balance_table(df, num, cat)
+        engine_time = time.perf_counter() - start
+        print(f"{'loop':>8} {loop_time:>8.3f}s")
+        print(f"{'engine':>8} {engine_time:>8.3f}s  speedup {loop_time / engine_time:.1f}")
+
+        tests = table.drop_duplicates("variable").reset_index(drop=True)
+        np.testing.assert_allclose(tests["statistic"], loop["statistic"], rtol=1e-10)
+        np.testing.assert_allclose(tests["p_value"], loop["p_value"], rtol=1e-10)
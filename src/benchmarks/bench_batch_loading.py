@@ -0,0 +1,43 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from config import RAW_DATA_DIR
+from data_loader import load_experiment_data_batch
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    n_exports = 16
+
+    df = pd.read_csv(RAW_DATA_DIR / f"all_apps_wide-{experiment_date}.csv")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_names = []
+        for i in range(n_exports):
+            export = df.copy()
+            export["participant.code"] = export["participant.code"] + f"_{i}"
+            path = Path(tmp_dir) / f"all_apps_wide-session{i:02d}.csv"
+            export.to_csv(path, index=False)
+            file_names.append(str(path))
+
+        print(f"=== Batch loading of {n_exports} exports ===")
+        print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+
+        serial_time = None
+        reference = None
+        for workers in sorted({1, 2, 4, os.cpu_count()}):
+            start = time.perf_counter()
+            frames = load_experiment_data_batch(file_names, max_workers=workers)
+            elapsed = time.perf_counter() - start
+
+            if serial_time is None:
+                serial_time = elapsed
+                reference = frames
+            else:
+                for expected, actual in zip(reference, frames):
+                    pd.testing.assert_frame_equal(expected, actual)
+
+            print(f"{workers:>8} {elapsed:>10.2f} {serial_time / elapsed:>8.2f}")
@@ -0,0 +1,26 @@
+import time
+
+from data_loader import load_experiment_data
+from thesis.modeling.bayesian import CHAPTER_BAYESIAN_SPECS, SamplerSettings, fit_bayesian
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    sampler = SamplerSettings(draws=500, tune=500)
+
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
+
+    print(f"=== Hierarchical logits: {sampler.chains} chains x {sampler.draws} draws ===")
+    print(f"{'model':>22} {'1 core':>8} {'parallel':>9} {'cached':>8}")
+
+    for spec in CHAPTER_BAYESIAN_SPECS:
+        timings, traces = [], []
+        for cores, use_cache in [(1, False), (None, True), (None, True)]:
+            start = time.perf_counter()
+            traces.append(fit_bayesian(main_trials_df, spec, sampler, cores=cores, use_cache=use_cache))
+            timings.append(time.perf_counter() - start)
+
+        assert "C(condition)" in traces[2].posterior
+        # the reloaded trace is the stored one, draw for draw
+        assert traces[2].posterior.equals(traces[1].posterior)
+
+        print(f"{spec.name:>22} {timings[0]:>8.1f} {timings[1]:>9.1f} {timings[2]:>8.2f}")
@@ -0,0 +1,58 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_experiment_data
+from thesis.modeling import cluster_bootstrap_rates
+
+GROUP_COLS = ["condition", "top1_correct"]
+
+
+def resample_loop(df: pd.DataFrame, n_boot: int, seed: int = 0) -> np.ndarray:
+    """Textbook cluster bootstrap: draw participants, rebuild the table, group."""
+    rng = np.random.default_rng(seed)
+    by_participant = dict(tuple(df.groupby("participant_code")))
+    codes = np.array(list(by_participant))
+
+    rates = []
+    for _ in range(n_boot):
+        drawn = rng.choice(codes, size=len(codes), replace=True)
+        sample = pd.concat([by_participant[code] for code in drawn], ignore_index=True)
+        rates.append(sample.groupby(GROUP_COLS)["switched"].mean().to_numpy())
+
+    return np.array(rates)
+
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    n_boot = 2000
+
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
+
+    print(f"=== Cluster bootstrap of switching rates, {n_boot} replicates ===")
+
+    n_loop = 100
+    start = time.perf_counter()
+    loop_rates = resample_loop(main_trials_df, n_loop)
+    loop_time = (time.perf_counter() - start) * n_boot / n_loop
+    print(f"{'resample loop':>20} {loop_time:>8.2f}s (extrapolated from {n_loop})")
+
+    reference = None
+    for workers in sorted({1, 2, os.cpu_count()}):
+        for ci in ["percentile", "bca"]:
+            start = time.perf_counter()
+            result = cluster_bootstrap_rates(
+                main_trials_df, "switched", GROUP_COLS, n_boot=n_boot, ci=ci, max_workers=workers
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{f'{ci}, {workers} workers':>20} {elapsed:>8.2f}s  speedup {loop_time / elapsed:.0f}")
+
+        # chunks carry their own seeds, so the worker count does not change the result
+        if reference is None:
+            reference = result
+        pd.testing.assert_frame_equal(reference, result)
+
+    # both samplers target the same distribution of replicate rates
+    np.testing.assert_allclose(loop_rates.std(axis=0, ddof=1), reference["se"], rtol=0.3)
@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from variable_constructer import construct_trial_level_variables
+
+LABELS = np.array(["poor", "standard", "good"], dtype=object)
+
+
+def make_trials(n_trials: int, seed: int = 0, messy: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    def labels(missing_rate=0.0):
+        values = LABELS[rng.integers(0, 3, n_trials)]
+        if messy:
+            # casing/whitespace noise and missing decisions exercise the
+            # normalization and NaN paths of both engines (see
+            # tests/test_construct_variables.py)
+            noisy = rng.random(n_trials) < 0.05
+            values = np.where(noisy, np.char.upper(values.astype(str)).astype(object) + " ", values)
+            values[rng.random(n_trials) < missing_rate] = np.nan
+        return pd.Series(values, dtype="str")
+
+    contains = rng.random((n_trials, 3)) < 0.5
+    contains[~contains.any(axis=1), 1] = True
+    set_order = np.argsort(rng.random((n_trials, 3)) + ~contains, axis=1)
+    elements = np.where(np.take_along_axis(contains, set_order, axis=1), LABELS[set_order], np.nan)
+
+    return pd.DataFrame({
+        "condition": pd.Series(np.array(["C1", "C2", "C3"])[rng.integers(0, 3, n_trials)], dtype="str"),
+        "y_true": labels(),
+        "point_pred_cal": labels(),
+        "point_pred_confidence": rng.uniform(0.4, 1.0, n_trials),
+        "cp_contains_poor": contains[:, 0].astype(float),
+        "cp_contains_standard": contains[:, 1].astype(float),
+        "cp_contains_good": contains[:, 2].astype(float),
+        "initial_decision": labels(missing_rate=0.02),
+        "initial_confidence": rng.integers(1, 6, n_trials).astype(float),
+        "final_decision": labels(missing_rate=0.02),
+        "final_confidence": rng.integers(1, 6, n_trials).astype(float),
+        "cp_set_el1": pd.Series(elements[:, 0], dtype="str"),
+        "cp_set_el2": pd.Series(elements[:, 1], dtype="str"),
+        "cp_set_el3": pd.Series(elements[:, 2], dtype="str"),
+    })
+
+
+if __name__ == '__main__':
+    print("=== construct_trial_level_variables ===")
+    print(f"{'trials':>10} {'pandas s':>9} {'coded s':>8} {'speedup':>8}")
+    for n_trials in [100_000, 1_000_000, 3_000_000]:
+        trials = make_trials(n_trials)
+
+        start = time.perf_counter()
+        construct_trial_level_variables(trials)
+        pandas_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        construct_trial_level_variables(trials, engine="coded")
+        coded_s = time.perf_counter() - start
+
+        print(f"{n_trials:>10} {pandas_s:>9.2f} {coded_s:>8.2f} {pandas_s / coded_s:>8.1f}")
@@ -0,0 +1,47 @@
+import time
+
+import numpy as np
+import pandas as pd
+import patsy
+
+from benchmarks.bench_model_batch import CHAPTER_SPECS
+from data_loader import load_experiment_data
+from thesis.modeling import clear_design_cache, model_matrices
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    n_copies = 50
+
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
+    # larger table with the same design: participant codes made unique per copy
+    trials = pd.concat(
+        [main_trials_df.assign(participant_code=main_trials_df["participant_code"] + f"_{i}") for i in range(n_copies)],
+        ignore_index=True,
+    )
+
+    print(f"=== Design matrices for {len(CHAPTER_SPECS)} chapter models on {len(trials)} trials ===")
+
+    start = time.perf_counter()
+    reference = []
+    for spec in CHAPTER_SPECS:
+        analysis_df = trials if spec.subset is None else trials.query(spec.subset)
+        reference.append(patsy.dmatrices(spec.formula, analysis_df, return_type="dataframe"))
+    patsy_time = time.perf_counter() - start
+
+    clear_design_cache()
+    start = time.perf_counter()
+    cold = [model_matrices(trials, spec.formula, spec.subset) for spec in CHAPTER_SPECS]
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = [model_matrices(trials, spec.formula, spec.subset) for spec in CHAPTER_SPECS]
+    warm_time = time.perf_counter() - start
+
+    for (expected_y, expected_X), (y, X), (warm_y, warm_X) in zip(reference, cold, warm):
+        pd.testing.assert_frame_equal(expected_X, X)
+        pd.testing.assert_frame_equal(X, warm_X)
+        np.testing.assert_array_equal(expected_y.iloc[:, 0].to_numpy(), y.to_numpy())
+
+    print(f"{'patsy per fit':>16} {patsy_time:>8.2f}s")
+    print(f"{'cache, cold':>16} {cold_time:>8.2f}s  speedup {patsy_time / cold_time:.2f}")
+    print(f"{'cache, warm':>16} {warm_time:>8.2f}s  speedup {patsy_time / warm_time:.2f}")
@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from scipy import special
+
+from thesis.modeling import fit_logit, fit_ols, model_matrices
+
+
+def make_model_trials(n_participants: int, n_trials: int = 40, n_cases: int = 15, seed: int = 0) -> pd.DataFrame:
+    """Trial table with participant-level condition, case effects and a
+    participant random intercept, so clustering matters."""
+    rng = np.random.default_rng(seed)
+    condition = np.array(["C1", "C2", "C3"])[rng.integers(0, 3, n_participants)]
+    participant_effect = rng.normal(0, 0.8, n_participants)
+    case_effect = rng.normal(0, 0.5, n_cases)
+
+    participant = np.repeat(np.arange(n_participants), n_trials)
+    case_id = rng.integers(0, n_cases, len(participant))
+    eta = (
+        0.3
+        + np.select([condition[participant] == "C2", condition[participant] == "C3"], [0.2, 0.5], 0.0)
+        + participant_effect[participant]
+        + case_effect[case_id]
+    )
+
+    return pd.DataFrame({
+        "participant_code": pd.Series(participant).map("p{:06d}".format),
+        "condition": condition[participant],
+        "case_id": case_id,
+        "final_correct": (rng.random(len(eta)) < special.expit(eta)).astype(int),
+    })
+
+
+def timed(fit):
+    start = time.perf_counter()
+    result = fit()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print("=== Cluster-robust logit/OLS: statsmodels vs. native ===")
+    print(f"{'trials':>10} {'model':>8} {'statsmodels':>12} {'native':>8} {'warm':>8} {'speedup':>8}")
+
+    for n_participants in [300, 3_000, 30_000]:
+        trials = make_model_trials(n_participants)
+        groups = trials["participant_code"]
+        y_small, X_small = model_matrices(trials, "final_correct ~ C(condition)")
+        y, X = model_matrices(trials, "final_correct ~ C(condition) + C(case_id)")
+        cluster = {"cov_type": "cluster", "cov_kwds": {"groups": groups}}
+
+        reference, sm_time = timed(lambda: sm.Logit(y, X).fit(disp=False, **cluster))
+        result, native_time = timed(lambda: fit_logit(y, X, groups))
+        nested = fit_logit(y_small, X_small, groups)
+        warm, warm_time = timed(lambda: fit_logit(y, X, groups, start=nested.params))
+
+        for fit in (result, warm):
+            np.testing.assert_allclose(fit.params, reference.params, rtol=1e-8, atol=1e-10)
+            np.testing.assert_allclose(fit.bse, reference.bse, rtol=1e-8)
+        print(f"{len(trials):>10} {'logit':>8} {sm_time:>12.3f} {native_time:>8.3f} {warm_time:>8.3f} {sm_time / native_time:>8.1f}")
+
+        reference, sm_time = timed(lambda: sm.OLS(y, X).fit(**cluster))
+        result, native_time = timed(lambda: fit_ols(y, X, groups))
+
+        np.testing.assert_allclose(result.params, reference.params, rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(result.bse, reference.bse, rtol=1e-8)
+        print(f"{len(trials):>10} {'ols':>8} {sm_time:>12.3f} {native_time:>8.3f} {'':>8} {sm_time / native_time:>8.1f}")
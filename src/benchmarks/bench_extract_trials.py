@@ -0,0 +1,31 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import RAW_DATA_DIR
+from data_loader.load_data import _reshape_trials_long
+
+
+def make_wide_export(n_participants: int, file_name: str) -> pd.DataFrame:
+    df = pd.read_csv(RAW_DATA_DIR / file_name)
+    idx = np.resize(np.arange(len(df)), n_participants)
+    df = df.iloc[idx].reset_index(drop=True)
+    df["participant.code"] = [f"p{i}" for i in range(n_participants)]
+    return df
+
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    file_name = f"all_apps_wide-{experiment_date}.csv"
+
+    print("=== Wide-to-long trial reshaping ===")
+    print(f"{'participants':>12} {'trials':>10} {'seconds':>10} {'us/participant':>15}")
+    for n in [1_000, 10_000, 100_000]:
+        wide_df = make_wide_export(n, file_name)
+
+        start = time.perf_counter()
+        trials = _reshape_trials_long(wide_df, "main_trials")
+        elapsed = time.perf_counter() - start
+
+        print(f"{n:>12} {len(trials):>10} {elapsed:>10.3f} {elapsed / n * 1e6:>15.2f}")
@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.formula.api as smf
+
+from data_loader import load_experiment_data
+from thesis.modeling import marginal_effects_batch
+
+FORMULAS = {
+    "shared_ai_confidence": ("logit", "switched ~ shared_ai_confidence * C(condition)"),
+    "initial_confidence": ("logit", "switched ~ initial_confidence * C(condition)"),
+    "confidence_gap": ("logit", "switched ~ confidence_gap * C(condition)"),
+    "lpm": ("ols", "final_correct ~ switched * top1_correct + C(condition)"),
+}
+
+
+def perturbation_loop(model, df: pd.DataFrame, effect: list[tuple[dict, float]], h: float = 1e-6) -> tuple[float, float]:
+    """Delta method the slow way: `model.predict` on counterfactual frames,
+    once per perturbed parameter."""
+    frames = [(df.assign(**assignment), weight) for assignment, weight in effect]
+
+    def value(params):
+        return sum(weight * model.model.predict(params, model._transform_predict_exog(frame)[0]).mean() for frame, weight in frames)
+
+    params = np.asarray(model.params)
+    gradient = np.array([(value(params + e) - value(params - e)) / (2 * h) for e in np.eye(len(params)) * h])
+    return value(params), np.sqrt(gradient @ np.asarray(model.cov_params()) @ gradient)
+
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
+    top1_mismatch_df = main_trials_df[main_trials_df["initial_top_1_agree"] == 0]
+    fit_kwargs = {"cov_type": "cluster", "cov_kwds": {"groups": top1_mismatch_df["participant_code"]}}
+
+    models = {}
+    for name, (estimator, formula) in FORMULAS.items():
+        if estimator == "logit":
+            models[name] = smf.logit(formula, data=top1_mismatch_df).fit(disp=False, **fit_kwargs)
+        else:
+            models[name] = smf.ols(formula, data=top1_mismatch_df).fit(**fit_kwargs)
+
+    print(f"=== Marginal effects by condition, {len(models)} models ===")
+    start = time.perf_counter()
+    table = marginal_effects_batch(models, by="condition")
+    engine_time = time.perf_counter() - start
+
+    # a condition contrast and the per-condition slopes of the confidence gap model, the slow way
+    gap = top1_mismatch_df["confidence_gap"]
+    step = 1e-4
+    effects = {
+        ("condition", "C3 - C1", None): [({"condition": "C3"}, 1.0), ({"condition": "C1"}, -1.0)],
+        **{
+            ("confidence_gap", "dydx", condition): [
+                ({"condition": condition, "confidence_gap": gap + step}, 1 / (2 * step)),
+                ({"condition": condition, "confidence_gap": gap - step}, -1 / (2 * step)),
+            ]
+            for condition in ["C1", "C2", "C3"]
+        },
+    }
+    start = time.perf_counter()
+    slow = {key: perturbation_loop(models["confidence_gap"], top1_mismatch_df, effect) for key, effect in effects.items()}
+    loop_time = (time.perf_counter() - start) * len(table) / len(effects)
+
+    print(f"{'loop':>8} {loop_time:>8.2f}s (extrapolated from {len(effects)} of {len(table)} effects)")
+    print(f"{'engine':>8} {engine_time:>8.2f}s  speedup {loop_time / engine_time:.0f}")
+
+    rows = table[table["model"] == "confidence_gap"]
+    for (variable, contrast, by), (estimate, std_err) in slow.items():
+        row = rows[(rows["variable"] == variable) & (rows["contrast"] == contrast) & ((rows["by"] == by) if by else rows["by"].isna())].iloc[0]
+        print(f"{variable:>15} {contrast:>8} {str(by):>5}  estimate diff {abs(row['estimate'] - estimate):.1e}  se diff {abs(row['std_err'] - std_err):.1e}")
@@ -0,0 +1,79 @@
+import os
+import time
+
+import pandas as pd
+import statsmodels.formula.api as smf
+
+from data_loader import load_experiment_data
+from thesis.modeling import ModelSpec, run_model_batch
+
+TOP1_MISMATCH = "initial_top_1_agree == 0"
+MISMATCH = "initial_agree_ai == 0"
+
+# the model specifications fitted in chapters 6.2 to 6.5
+CHAPTER_SPECS = [
+    ModelSpec("final_correct ~ C(condition)", name="A1a"),
+    ModelSpec("final_correct ~ C(condition) + C(case_id)", name="A1b"),
+    ModelSpec("final_correct ~ switched * top1_correct + C(condition)", "ols", TOP1_MISMATCH, name="A14"),
+    ModelSpec("final_correct ~ switched * C(condition)", subset=TOP1_MISMATCH, name="6.3 switching"),
+    *[
+        ModelSpec(
+            f"{dependent_var} ~ C(condition) + C(case_id)",
+            subset=" and ".join(filter(None, [MISMATCH, conditions, subset])),
+            name=name,
+        )
+        for conditions in [None, "condition in ['C2', 'C3']"]
+        for name, dependent_var, subset in [
+            ("Overreliance", "final_agree_ai", "ai_correct == 0"),
+            ("Underreliance", "final_agree_ai", "ai_correct == 1"),
+            ("Appropriate Reliance", "appropriate_reliance", None),
+        ]
+    ],
+    ModelSpec("switched ~ shared_ai_confidence * C(condition)", subset=TOP1_MISMATCH, name="6.5 shared_ai_confidence"),
+    ModelSpec("switched ~ initial_confidence * C(condition)", subset=TOP1_MISMATCH, name="6.5 initial_confidence"),
+    ModelSpec("switched ~ confidence_gap * C(condition)", subset=TOP1_MISMATCH, name="6.5 confidence_gap"),
+]
+
+
+def fit_like_scripts(df: pd.DataFrame, specs: list[ModelSpec]) -> list[pd.Series]:
+    """The chapter scripts' pattern: subset, fit and summarize one model after another."""
+    params = []
+    for spec in specs:
+        analysis_df = df if spec.subset is None else df.query(spec.subset)
+        model = getattr(smf, spec.estimator)(spec.formula, data=analysis_df)
+        fit_kwargs = {"disp": False} if spec.estimator == "logit" else {}
+        result = model.fit(
+            cov_type="cluster",
+            cov_kwds={"groups": analysis_df["participant_code"]},
+            **fit_kwargs,
+        )
+        str(result.summary())
+        params.append(result.params)
+
+    return params
+
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    n_repeats = 4
+
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
+    specs = CHAPTER_SPECS * n_repeats
+
+    print(f"=== Fitting {len(specs)} chapter models ===")
+    print(f"{'runner':>16} {'seconds':>10} {'speedup':>8}")
+
+    start = time.perf_counter()
+    reference = fit_like_scripts(main_trials_df, specs)
+    serial_time = time.perf_counter() - start
+    print(f"{'serial scripts':>16} {serial_time:>10.2f} {1:>8.2f}")
+
+    for workers in sorted({1, 2, 4, os.cpu_count()}):
+        start = time.perf_counter()
+        results = run_model_batch(main_trials_df, specs, max_workers=workers)
+        elapsed = time.perf_counter() - start
+
+        for expected, result in zip(reference, results):
+            pd.testing.assert_series_equal(expected, result.coefficients["coef"], check_names=False)
+
+        print(f"{f'batch, {workers} workers':>16} {elapsed:>10.2f} {serial_time / elapsed:>8.2f}")
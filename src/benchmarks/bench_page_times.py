@@ -0,0 +1,105 @@
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_loader import attach_page_times, load_page_time_data
+
+
+# (app, rounds, pages per round); round_number restarts in every app
+PAGE_LOG_APPS = [
+    ("consent", 1, ["Consent"]),
+    ("example_trials", 3, ["Stage1", "Stage2", "Feedback"]),
+    ("main_trials", 15, ["Stage1", "Stage2", "Feedback"]),
+]
+
+
+def make_page_log(n_participants: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    app_name, page_name, round_number = [], [], []
+    for app, n_rounds, pages in PAGE_LOG_APPS:
+        app_name += [app] * (n_rounds * len(pages))
+        page_name += pages * n_rounds
+        round_number += list(np.repeat(np.arange(1, n_rounds + 1), len(pages)))
+    n_pages = len(app_name)
+
+    n_rows = n_participants * n_pages
+    participant = np.repeat(np.arange(n_participants), n_pages)
+    durations = rng.exponential(20, n_rows)
+
+    df = pd.DataFrame({
+        "participant_code": np.char.add("p", participant.astype(str)),
+        "app_name": np.tile(app_name, n_participants),
+        "page_name": np.tile(page_name, n_participants),
+        "round_number": np.tile(round_number, n_participants),
+        "page_index": np.tile(np.arange(n_pages), n_participants),
+        "epoch_time_completed": 1.7e9 + np.cumsum(durations),
+        "is_wait_page": 0,
+    })
+
+    # exports are not ordered by participant
+    return df.sample(frac=1, random_state=seed)
+
+
+def legacy_page_times(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df = df.sort_values(["participant_code", "round_number", "page_index"])
+    df["page_time_sec"] = (
+        df.groupby(["participant_code", "round_number"])["epoch_time_completed"]
+        .diff()
+    )
+    return df
+
+
+def reference_page_times(path: Path) -> pd.DataFrame:
+    """Grouped diff over each participant's pages in page order, across apps."""
+    df = pd.read_csv(path)
+    df = df.sort_values(["participant_code", "page_index"])
+    df["page_time_sec"] = df.groupby("participant_code")["epoch_time_completed"].diff()
+    return df
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+if __name__ == '__main__':
+    print("=== Page-time pipeline ===")
+    print(f"{'rows':>10} {'legacy s':>9} {'legacy MB':>10} {'new s':>7} {'new MB':>8} {'attach s':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_participants in [10_000, 50_000]:
+            path = Path(tmp_dir) / f"PageTimes-{n_participants}.csv"
+            make_page_log(n_participants).to_csv(path, index=False)
+
+            _, legacy_s, legacy_mb = measure(lambda: legacy_page_times(path))
+            new, new_s, new_mb = measure(lambda: load_page_time_data(str(path)))
+
+            # the legacy grouping by round mixes apps, so durations are
+            # checked against the per-participant diff instead
+            reference = reference_page_times(path)
+            np.testing.assert_allclose(
+                reference["page_time_sec"].to_numpy(),
+                new["page_time_sec"].to_numpy(),
+            )
+
+            trials = pd.DataFrame({
+                "participant_code": np.repeat([f"p{i}" for i in range(n_participants)], 15),
+                "trial_index": np.tile(np.arange(1, 16), n_participants),
+            })
+            start = time.perf_counter()
+            attached = attach_page_times(trials, new)
+            attach_s = time.perf_counter() - start
+            assert attached.filter(like="page_time_").notna().all().all()
+
+            print(f"{len(new):>10} {legacy_s:>9.2f} {legacy_mb:>10.0f} {new_s:>7.2f} {new_mb:>8.0f} {attach_s:>9.2f}")
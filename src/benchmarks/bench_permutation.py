@@ -0,0 +1,55 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_experiment_data
+from thesis.modeling import permutation_test
+
+VALUE_COLS = ["switched", "final_correct", "over_reliance", "appropriate_reliance"]
+
+
+def groupby_loop(df: pd.DataFrame, n_permutations: int, seed: int = 0) -> np.ndarray:
+    """Shuffle participant conditions, merge them back and re-run the groupby."""
+    rng = np.random.default_rng(seed)
+    conditions = df.groupby("participant_code")["condition"].first()
+
+    ranges = []
+    for _ in range(n_permutations):
+        shuffled = pd.Series(rng.permutation(conditions.to_numpy()), index=conditions.index)
+        rates = df.assign(condition=df["participant_code"].map(shuffled)).groupby("condition")[VALUE_COLS].mean()
+        ranges.append((rates.max() - rates.min()).to_numpy())
+
+    return np.array(ranges)
+
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    n_permutations = 10_000
+
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
+
+    print(f"=== Permutation test of {len(VALUE_COLS)} rates, {n_permutations} permutations ===")
+
+    n_loop = 200
+    start = time.perf_counter()
+    loop_ranges = groupby_loop(main_trials_df, n_loop)
+    loop_time = (time.perf_counter() - start) * n_permutations / n_loop
+    print(f"{'groupby loop':>12} {loop_time:>8.2f}s (extrapolated from {n_loop})")
+
+    reference = None
+    for workers in sorted({1, 2, os.cpu_count()}):
+        start = time.perf_counter()
+        result = permutation_test(main_trials_df, VALUE_COLS, n_permutations=n_permutations, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{f'{workers} workers':>12} {elapsed:>8.2f}s  speedup {loop_time / elapsed:.0f}")
+
+        if reference is None:
+            reference = result
+        pd.testing.assert_frame_equal(reference, result)
+
+    # the loop's null distribution of the range agrees with the engine's p-values
+    observed = reference.query("statistic == 'range'")["observed"].to_numpy()
+    loop_p = (1 + (loop_ranges >= observed - 1e-12).sum(axis=0)) / (1 + n_loop)
+    print(pd.DataFrame({"variable": VALUE_COLS, "engine_p": reference.query("statistic == 'range'")["p_value"].to_numpy(), "loop_p": loop_p}))
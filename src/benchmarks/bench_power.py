@@ -0,0 +1,53 @@
+import os
+import time
+
+import numpy as np
+import statsmodels.formula.api as smf
+
+from thesis.modeling import power_analysis
+from thesis.modeling.power import simulate_design, simulate_outcomes
+
+FORMULA = "outcome ~ C(condition) + C(case_id)"
+EFFECTS = {"C2": 0.0, "C3": 0.4}
+
+
+def statsmodels_loop(n_per_condition: int, n_replicates: int, seed: int = 0) -> np.ndarray:
+    """One simulated dataset and one formula fit per replicate."""
+    rng = np.random.default_rng(seed)
+    design = simulate_design(n_per_condition)
+
+    p_values = []
+    for _ in range(n_replicates):
+        df = design.assign(outcome=simulate_outcomes(design, EFFECTS, rng=rng)[0])
+        result = smf.logit(FORMULA, data=df).fit(
+            cov_type="cluster",
+            cov_kwds={"groups": df["participant_code"]},
+            disp=False,
+        )
+        p_values.append(result.pvalues["C(condition)[T.C3]"])
+
+    return np.array(p_values)
+
+
+if __name__ == '__main__':
+    n_per_condition = 50
+    n_replicates = 2000
+
+    print(f"=== Power of A1b-style logits, {n_replicates} replicates of {3 * n_per_condition} participants ===")
+
+    n_loop = 50
+    start = time.perf_counter()
+    loop_p = statsmodels_loop(n_per_condition, n_loop)
+    loop_time = (time.perf_counter() - start) * n_replicates / n_loop
+    print(f"{'statsmodels loop':>18} {loop_time:>8.1f}s (extrapolated from {n_loop})")
+
+    for workers in sorted({1, 2, os.cpu_count()}):
+        start = time.perf_counter()
+        result = power_analysis(
+            [n_per_condition], [EFFECTS], formula=FORMULA, n_replicates=n_replicates, max_workers=workers
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{f'batched, {workers} workers':>18} {elapsed:>8.1f}s  speedup {loop_time / elapsed:.0f}")
+
+    print(result.to_string(index=False))
+    print(f"power from the statsmodels loop: {(loop_p < 0.05).mean():.2f} (n={n_loop})")
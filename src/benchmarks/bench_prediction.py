@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.formula.api as smf
+
+from data_loader import load_experiment_data
+from thesis.modeling import clear_prediction_cache, prediction_grid
+
+
+def get_prediction_loop(model, grid: pd.DataFrame, condition_col: str = "condition") -> pd.DataFrame:
+    """One `get_prediction` call per condition, as the figures did for a single one."""
+    frames = [
+        model.get_prediction(rows.reset_index(drop=True)).summary_frame(alpha=0.05)
+        for _, rows in grid.groupby(condition_col, sort=False)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == '__main__':
+    experiment_date = "2026-03-20"
+    n_repeats = 20
+
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
+    top1_mismatch_df = main_trials_df[main_trials_df["initial_top_1_agree"] == 0]
+    groups = {"groups": top1_mismatch_df["participant_code"]}
+
+    logit = smf.logit("switched ~ confidence_gap * C(condition)", data=top1_mismatch_df).fit(disp=False, cov_type="cluster", cov_kwds=groups)
+    lpm = smf.ols("final_correct ~ switched * top1_correct + C(condition)", data=top1_mismatch_df).fit(cov_type="cluster", cov_kwds=groups)
+
+    cases = [
+        ("confidence gap logit", logit, {"condition": None, "confidence_gap": np.linspace(-1, 1, 200)}, "predicted"),
+        ("accuracy LPM", lpm, {"condition": None, "top1_correct": [0, 1], "switched": [0, 1]}, "mean"),
+    ]
+    for label, model, grid, mean_col in cases:
+        print(f"=== Prediction grid, {label} ===")
+        clear_prediction_cache()
+        start = time.perf_counter()
+        result = prediction_grid(model, grid)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            prediction_grid(model, grid)
+        warm = (time.perf_counter() - start) / n_repeats
+
+        frame = result[list(grid)]
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            reference = get_prediction_loop(model, frame)
+        loop_time = (time.perf_counter() - start) / n_repeats
+
+        print(f"{'loop':>8} {loop_time * 1000:>8.2f}ms (pointwise only)")
+        print(f"{'cold':>8} {cold * 1000:>8.2f}ms (incl. simultaneous band)")
+        print(f"{'cached':>8} {warm * 1000:>8.3f}ms  speedup {loop_time / warm:.0f}")
+
+        np.testing.assert_allclose(result["mean"], reference[mean_col], atol=1e-12)
+        np.testing.assert_allclose(result["ci_lower"], reference.filter(like="ci_lower").iloc[:, 0], atol=1e-12)
+        np.testing.assert_allclose(result["ci_upper"], reference.filter(like="ci_upper").iloc[:, 0], atol=1e-12)
+        assert (result["band_lower"] <= result["ci_lower"]).all() and (result["band_upper"] >= result["ci_upper"]).all()
@@ -1,5 +1,7 @@
-from .paths import RAW_DATA_DIR
+from .paths import CACHE_DIR, PROCESSED_DATA_DIR, RAW_DATA_DIR
 
 __all__ = [
+    "CACHE_DIR",
+    "PROCESSED_DATA_DIR",
     "RAW_DATA_DIR",
 ]
\ No newline at end of file
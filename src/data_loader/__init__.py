@@ -1,6 +1,20 @@
-from .load_data import load_experiment_data, load_page_time_data
+from .batch import load_experiment_data_batch
+from .case_store import join_case_features, load_case_table
+from .export import export_cleaned_data
+from .ingest import ingest_exports
+from .load_data import load_experiment_data, load_trials, stream_experiment_data
+from .page_times import attach_page_times, aggregate_page_times, load_page_time_data
 
 __all__ = [
+    "aggregate_page_times",
+    "attach_page_times",
+    "export_cleaned_data",
+    "ingest_exports",
+    "join_case_features",
+    "load_case_table",
     "load_experiment_data",
-    "load_page_time_data"
+    "load_experiment_data_batch",
+    "load_page_time_data",
+    "load_trials",
+    "stream_experiment_data",
 ]
\ No newline at end of file
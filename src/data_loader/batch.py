@@ -0,0 +1,34 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .case_store import load_case_table
+from .load_data import EXPERIMENT_FRAMES, _build_experiment_frames, _filter_df, _read_raw_export
+
+
+def _process_export(file_name: str) -> tuple:
+    df_raw = _filter_df(_read_raw_export(file_name))
+    return _build_experiment_frames(df_raw, load_case_table())
+
+
+def load_experiment_data_batch(
+    file_names: list[str],
+    max_workers: int | None = None,
+) -> tuple:
+    """Load several exports in parallel, one worker process per file.
+
+    Parsing, filtering, trial extraction and variable construction run in
+    the workers; results are concatenated in the order of `file_names`, so
+    the output does not depend on scheduling. `max_workers=1` runs serially
+    in-process.
+    """
+    if max_workers == 1:
+        results = [_process_export(file_name) for file_name in file_names]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_process_export, file_names))
+
+    return tuple(
+        pd.concat([result[i] for result in results], ignore_index=True)
+        for i in range(len(EXPERIMENT_FRAMES))
+    )
@@ -0,0 +1,84 @@
+import hashlib
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from config import CACHE_DIR
+
+# source files whose changes invalidate cached frames
+CODE_DIRS = [
+    Path(__file__).resolve().parent,
+    Path(__file__).resolve().parents[1] / "variable_constructer",
+]
+
+
+def _hash_file(path: Path, digest) -> None:
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+
+def fingerprint(paths: list[Path]) -> str:
+    digest = hashlib.sha256()
+
+    for path in paths:
+        digest.update(path.name.encode())
+        _hash_file(path, digest)
+
+    for code_dir in CODE_DIRS:
+        for path in sorted(code_dir.glob("*.py")):
+            digest.update(path.name.encode())
+            _hash_file(path, digest)
+
+    return digest.hexdigest()[:16]
+
+
+def cache_path(name: str, key: str) -> Path:
+    return CACHE_DIR / f"{name}-{key}"
+
+
+def write_frame(frame: pd.DataFrame, path: Path, index: bool | None = None) -> None:
+    """Store `frame` as Parquet, keeping object columns of integers and
+    missing values (e.g. initial_pos_in_set) as objects on reading.
+
+    Such columns are written as nullable integers even when all missing, so
+    parts of one dataset (see `stream_experiment_data`) share a schema.
+    """
+    integer_objects = [
+        column for column in frame.columns
+        if frame[column].dtype == object
+        and pd.api.types.infer_dtype(frame[column], skipna=True) in ("integer", "empty")
+    ]
+    stored = frame.astype(dict.fromkeys(integer_objects, "Int64"))
+    # pandas keeps attrs in the Parquet metadata
+    stored.attrs = {**frame.attrs, "object_columns": integer_objects}
+    stored.to_parquet(path, index=index)
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Frame stored by `write_frame`; `path` may also be a directory of parts."""
+    frame = pd.read_parquet(path)
+    object_columns = frame.attrs.pop("object_columns", [])
+    return frame.astype(dict.fromkeys(object_columns, object))
+
+
+def read_cached_frame(name: str, key: str, frame_name: str) -> pd.DataFrame | None:
+    path = cache_path(name, key) / f"{frame_name}.parquet"
+    if not path.exists():
+        return None
+
+    return read_frame(path)
+
+
+def write_cached_frame(name: str, key: str, frame_name: str, frame: pd.DataFrame) -> None:
+    path = cache_path(name, key)
+    if not path.exists():
+        # stale entries for the same export are replaced, not accumulated
+        for stale in CACHE_DIR.glob(f"{name}-" + "?" * len(key)):
+            shutil.rmtree(stale, ignore_errors=True)
+        path.mkdir(parents=True)
+
+    tmp_path = path / f"{frame_name}.parquet.tmp"
+    write_frame(frame, tmp_path)
+    tmp_path.replace(path / f"{frame_name}.parquet")
\ No newline at end of file
@@ -0,0 +1,61 @@
+from functools import cache
+
+import pandas as pd
+
+from config import RAW_DATA_DIR
+
+CASE_FILE_NAME = "tasks_main_trials.csv"
+
+CP_SET_COLUMNS = ["cp_set_el1", "cp_set_el2", "cp_set_el3"]
+
+
+def _parse_cp_sets(sorted_sets: pd.Series) -> pd.DataFrame:
+    # "['poor', 'standard']" -> ("poor", "standard", NaN), parsed for the
+    # whole column at once instead of ast.literal_eval per row
+    unquoted = sorted_sets.str.replace(r'^"(.*)"$', r"\1", regex=True)
+    elements = (
+        unquoted.str.extractall(r"(['\"])(.*?)\1")[1]
+        .unstack()
+        .reindex(index=sorted_sets.index, columns=[0, 1, 2])
+    )
+    elements.columns = CP_SET_COLUMNS
+
+    return elements
+
+
+@cache
+def load_case_table(file_name: str = CASE_FILE_NAME) -> pd.DataFrame:
+    """Case metadata indexed by `case_id`, with the conformal set pre-parsed
+    into `cp_set_el1..3`. Loaded once per process; treat it as read-only."""
+    case_df = pd.read_csv(RAW_DATA_DIR / file_name)
+    case_df[CP_SET_COLUMNS] = _parse_cp_sets(case_df["cp_standard_sorted_set"])
+
+    return case_df.set_index("case_id")
+
+
+def feature_columns(case_table: pd.DataFrame) -> list[str]:
+    return [c for c in case_table.columns if c.startswith("feat_")]
+
+
+def join_case_features(
+    trials: pd.DataFrame,
+    columns: list[str] | None = None,
+    case_table: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Left-join case columns onto a trial frame by its `case_id`.
+
+    Defaults to all `feat_*` features, the calibrated point-prediction
+    confidence and the parsed conformal set. Columns the trials already
+    have (e.g. `cp_set_el1..3` on loader frames) are left as they are.
+    """
+    if case_table is None:
+        case_table = load_case_table()
+
+    if columns is None:
+        columns = feature_columns(case_table) + [
+            "point_pred_confidence_cal_prediction",
+            "cp_standard_set_size",
+        ] + CP_SET_COLUMNS
+
+    columns = [c for c in columns if c not in trials.columns]
+    return trials.join(case_table[columns], on="case_id")
@@ -0,0 +1,60 @@
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from config import PROCESSED_DATA_DIR, RAW_DATA_DIR
+from .load_data import _filter_df
+
+EXPORT_FORMATS = {"csv", "parquet"}
+
+_EXPORT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+
+
+def _content_hash(df: pd.DataFrame) -> str:
+    digest = hashlib.sha256()
+    digest.update("\x1f".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _write_cleaned_data(file_name: str, file_format: str) -> Path:
+    df = _filter_df(pd.read_csv(RAW_DATA_DIR / file_name))
+
+    output_path = PROCESSED_DATA_DIR / f"df_cleaned.{file_format}"
+    hash_path = output_path.with_name(output_path.name + ".sha256")
+    content_hash = _content_hash(df)
+
+    # unchanged content: keep the existing artifact
+    if output_path.exists() and hash_path.exists() and hash_path.read_text() == content_hash:
+        return output_path
+
+    PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    if file_format == "csv":
+        df.to_csv(output_path, index=False)
+    else:
+        df.to_parquet(output_path, index=False)
+    hash_path.write_text(content_hash)
+
+    return output_path
+
+
+def export_cleaned_data(
+    file_name: str,
+    file_format: str = "csv",
+    background: bool = True,
+) -> Future | Path:
+    """Write the filtered wide export to `data/processed/df_cleaned.<format>`.
+
+    The write is skipped when the filtered content hash matches the existing
+    artifact. With `background=True` the stage runs on a worker thread and a
+    Future resolving to the output path is returned.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {file_format!r}, expected one of {sorted(EXPORT_FORMATS)}")
+
+    if background:
+        return _EXPORT_EXECUTOR.submit(_write_cleaned_data, file_name, file_format)
+
+    return _write_cleaned_data(file_name, file_format)
@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from config import CACHE_DIR, RAW_DATA_DIR
+from .cache import fingerprint, read_frame, write_frame
+from .case_store import load_case_table
+from .load_data import EXPERIMENT_FRAMES, _build_experiment_frames, _filter_df, _read_raw_export
+
+POOLED_DIR = CACHE_DIR / "pooled"
+
+
+def _read_store(store_dir: Path) -> tuple[dict, dict[str, pd.DataFrame] | None]:
+    registry_path = store_dir / "registry.json"
+    if not registry_path.exists():
+        return {}, None
+
+    registry = json.loads(registry_path.read_text())
+    # a change in the loader/constructor code invalidates the whole store
+    if registry.get("code") != fingerprint([]):
+        return {}, None
+
+    frames = {
+        frame_name: read_frame(store_dir / f"{frame_name}.parquet")
+        for frame_name in EXPERIMENT_FRAMES
+    }
+
+    return registry, frames
+
+
+def _write_store(store_dir: Path, registry: dict, frames: dict[str, pd.DataFrame]) -> None:
+    store_dir.mkdir(parents=True, exist_ok=True)
+    for frame_name, frame in frames.items():
+        write_frame(frame, store_dir / f"{frame_name}.parquet")
+    (store_dir / "registry.json").write_text(json.dumps(registry, indent=2))
+
+
+def ingest_exports(
+    file_names: list[str] | None = None,
+    store_dir: Path | None = None,
+) -> tuple:
+    """Pool several wide exports into one stored dataset.
+
+    Exports are registered by content fingerprint, so unchanged files are
+    skipped outright. Participants are deduplicated on `participant.code`
+    and only participants not yet in the store are reshaped and run through
+    the variable construction. Returns the pooled frames in the same order
+    as `load_experiment_data`.
+    """
+    if file_names is None:
+        file_names = sorted(p.name for p in RAW_DATA_DIR.glob("all_apps_wide-*.csv"))
+    if store_dir is None:
+        store_dir = POOLED_DIR
+
+    registry, frames = _read_store(store_dir)
+    registry = {"code": fingerprint([]), "exports": registry.get("exports", {})}
+    known_codes = set() if frames is None else set(frames["participants"]["participant.code"])
+
+    changed = False
+    for file_name in file_names:
+        export_key = fingerprint([RAW_DATA_DIR / file_name])
+        if registry["exports"].get(file_name) == export_key:
+            continue
+
+        df_raw = _filter_df(_read_raw_export(file_name))
+        df_raw = df_raw[~df_raw["participant.code"].isin(known_codes)]
+        df_raw = df_raw.drop_duplicates(subset="participant.code")
+
+        if not df_raw.empty:
+            new_frames = dict(zip(EXPERIMENT_FRAMES, _build_experiment_frames(df_raw, load_case_table())))
+            if frames is None:
+                frames = new_frames
+            else:
+                frames = {
+                    frame_name: pd.concat([frames[frame_name], new_frames[frame_name]], ignore_index=True)
+                    for frame_name in EXPERIMENT_FRAMES
+                }
+            known_codes.update(df_raw["participant.code"])
+
+        registry["exports"][file_name] = export_key
+        changed = True
+
+    if frames is None:
+        raise FileNotFoundError(f"No exports with participants to ingest in {file_names}")
+
+    if changed:
+        _write_store(store_dir, registry, frames)
+
+    return tuple(frames[frame_name] for frame_name in EXPERIMENT_FRAMES)
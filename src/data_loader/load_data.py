@@ -1,10 +1,15 @@
+import hashlib
 import pandas as pd
 import re
-from functools import cache
-import ast
+from functools import cache, cached_property
+from pathlib import Path
+import shutil
 
-from config import RAW_DATA_DIR
-from variable_constructer import construct_trial_level_variables, create_participant_stats
+from config import CACHE_DIR, RAW_DATA_DIR
+from .case_store import CASE_FILE_NAME, CP_SET_COLUMNS, join_case_features, load_case_table
+from .cache import fingerprint, read_cached_frame, write_cached_frame, write_frame
+from variable_constructer import (PARTICIPANT_OUTCOME_METRICS, aggregate_participants, compact_trial_table,
+                                  compute_variables, construct_trial_level_variables, create_participant_stats)
 
 PLAYER_COLUMNS_TO_DROP = {
     "id_in_group",
@@ -13,6 +18,83 @@ PLAYER_COLUMNS_TO_DROP = {
 }
 
 
+# order of the blocks when an ExperimentData is unpacked like a tuple
+EXPERIMENT_FRAMES = [
+    "main_trials",
+    "control_measures",
+    "participant_stats",
+    "participants",
+    "example_trials",
+]
+
+# blocks of the wide oTree export consumed by the pipeline; everything else
+# (session metadata, instructions, closing) is never parsed
+RAW_COLUMN_PREFIXES = (
+    "participant.",
+    "consent.1.",
+    "checks.1.",
+    "main_trials.",
+    "example_trials.",
+    "cognitive_load.1.",
+    "control_measures.1.",
+)
+
+RAW_TEXT_FIELDS = {
+    "code",
+    "label",
+    "_current_app_name",
+    "_current_page_name",
+    "time_started_utc",
+    "mturk_worker_id",
+    "mturk_assignment_id",
+    "condition",
+    "y_true",
+    "point_pred_cal",
+    "gender",
+    "education",
+    "domain_experience",
+    "comment",
+}
+
+RAW_INT_FIELDS = {
+    "id_in_session",
+    "_is_bot",
+    "_index_in_pages",
+    "_max_page_index",
+    "visited",
+    "attempts_decision_authority",
+    "attempts_task_domain",
+    "failed_checks",
+}
+
+RAW_FLOAT_FIELDS = {
+    "payoff",
+    "consent_agree",
+    "check_decision_authority",
+    "check_task_domain",
+    "case_id",
+    "initial_decision",
+    "initial_confidence",
+    "final_decision",
+    "final_confidence",
+    "final_correct",
+    "point_pred_confidence",
+    "cp_contains_poor",
+    "cp_contains_standard",
+    "cp_contains_good",
+    "page_duration_stage1",
+    "page_duration_stage2",
+    "cognitive_load_mental",
+    "age",
+    "ai_attitude",
+    "ai_trust",
+    "risk_aversion",
+    "ai_literacy_ail2",
+    "ai_literacy_sk9",
+    "ai_literacy_sk10",
+    "ai_literacy_ue2",
+}
+
 CONDITION_MAP = {
     1: "poor",
     2: "standard",
@@ -34,72 +116,61 @@ def _get_participants_df(df: pd.DataFrame) -> pd.DataFrame:
         ])
     ]
 
-    return df[participant_cols].copy()
-
+    return df[participant_cols]
 
-def _extract_trials(df, prefix, trials_df):
-    pattern = re.compile(rf"^{prefix}\.(\d+)\.(.+)$")
-    records = []
 
-    for _, row in df.iterrows():
-        participant_code = row.get("participant.code")
-        condition = row.get("consent.1.player.condition")
-        trial_buffer = {}
+def _parse_trial_columns(columns, prefix: str) -> list[tuple[str, int, str]]:
+    """Map `<prefix>.<n>.player.<field>` column names to (column, n, field)."""
+    pattern = re.compile(rf"^{prefix}\.(\d+)\.(?:player\.)?(.+)$")
+    parsed = []
 
-        for col, value in row.items():
-            match = pattern.match(col)
-            if not match:
-                continue
+    for col in columns:
+        match = pattern.match(col)
+        if not match:
+            continue
 
-            trial_idx = int(match.group(1))
-            field = match.group(2)
+        field = match.group(2)
+        if field in PLAYER_COLUMNS_TO_DROP:
+            continue
 
-            if field.startswith("player."):
-                field = field.replace("player.", "", 1)
+        parsed.append((col, int(match.group(1)), field))
 
-            if field in PLAYER_COLUMNS_TO_DROP:
-                continue
+    return parsed
 
-            trial_buffer.setdefault(trial_idx, {})[field] = value
 
-        for trial_idx, data in trial_buffer.items():
-            data["participant_code"] = participant_code
-            data["condition"] = condition
-            data["trial_index"] = trial_idx
-            records.append(data)
+def _reshape_trials_long(df: pd.DataFrame, prefix: str) -> pd.DataFrame:
+    # column names are parsed once; the frame is then pivoted to one row per
+    # participant and trial in a single stack instead of row-by-row
+    parsed = _parse_trial_columns(df.columns, prefix)
 
-    df_trials = pd.DataFrame(records)
-    for col in ["initial_decision", "final_decision"]:
-        df_trials[col] = df_trials[col].map(CONDITION_MAP)
+    wide = df[[col for col, _, _ in parsed]]
+    wide.columns = pd.MultiIndex.from_tuples(
+        [(trial_idx, field) for _, trial_idx, field in parsed],
+        names=["trial_index", None],
+    )
+    wide.index = pd.RangeIndex(len(df), name="_row")
 
-    def parse_cp_set(x):
-        if pd.isna(x):
-            return []
+    df_trials = wide.stack(level="trial_index", future_stack=True)
+    df_trials.columns.name = None
 
-        if isinstance(x, str) and x.startswith('"') and x.endswith('"'):
-            x = x[1:-1]
+    rows = df_trials.index.get_level_values("_row")
+    df_trials["participant_code"] = df["participant.code"].to_numpy()[rows]
+    df_trials["condition"] = df["consent.1.player.condition"].to_numpy()[rows]
+    df_trials["trial_index"] = df_trials.index.get_level_values("trial_index")
 
-        try:
-            parsed = ast.literal_eval(x)
-            if isinstance(parsed, list):
-                return parsed
-            else:
-                return []
-        except (ValueError, SyntaxError):
-            return []
+    return df_trials.reset_index(drop=True)
 
-    parsed_series = trials_df["cp_standard_sorted_set"].apply(parse_cp_set)
 
-    trials_df[["cp_set_el1", "cp_set_el2", "cp_set_el3"]] = (
-        pd.DataFrame(parsed_series.tolist(), index=trials_df.index)
-        .reindex(columns=[0, 1, 2])
-    )
+def _extract_trials(df, prefix, case_table):
+    df_trials = _reshape_trials_long(df, prefix)
+    for col in ["initial_decision", "final_decision"]:
+        df_trials[col] = df_trials[col].map(CONDITION_MAP)
 
-    if "case_id" in df_trials.columns and "case_id" in trials_df.columns:
-        df_trials = df_trials.merge(
-            trials_df[["case_id", "confidence_bin_point_pred", "cp_set_el1", "cp_set_el2", "cp_set_el3"]],
-            on="case_id",
-            how="left"
+    if "case_id" in df_trials.columns:
+        df_trials = join_case_features(
+            df_trials,
+            ["confidence_bin_point_pred"] + CP_SET_COLUMNS,
+            case_table,
         ).rename(columns={
             "confidence_bin_point_pred": "point_predict_conf_bin"
         })
@@ -114,7 +185,7 @@ def _extract_trials(df, prefix, trials_df):
 
 def _extract_single_block(df, prefix, mandatory_col):
     cols = [c for c in df.columns if c.startswith(f"{prefix}.1.")]
-    out = df[["participant.code"] + cols].copy()
+    out = df[["participant.code"] + cols]
 
     rename_map = {
         c: c.replace(f"{prefix}.1.player.", "", 1)
@@ -134,6 +205,38 @@ def _extract_single_block(df, prefix, mandatory_col):
     return out
 
 
+def _raw_column_dtype(col: str) -> str | None:
+    field = col.rsplit(".", 1)[-1]
+    if field in RAW_TEXT_FIELDS:
+        return "str"
+    if field in RAW_INT_FIELDS:
+        return "int64"
+    if field in RAW_FLOAT_FIELDS:
+        return "float64"
+    # fields this loader does not know are left to the parser's inference
+    return None
+
+
+def _read_raw_export(file_name: str, engine: str = "c", chunksize: int | None = None):
+    header = pd.read_csv(RAW_DATA_DIR / file_name, nrows=0).columns
+
+    usecols = [
+        c for c in header
+        if c.startswith(RAW_COLUMN_PREFIXES)
+        # only the per-app player fields; participant.payoff is kept
+        and not (".player." in c and c.rsplit(".", 1)[-1] in PLAYER_COLUMNS_TO_DROP)
+    ]
+    dtypes = {c: _raw_column_dtype(c) for c in usecols}
+
+    return pd.read_csv(
+        RAW_DATA_DIR / file_name,
+        usecols=usecols,
+        dtype={c: dtype for c, dtype in dtypes.items() if dtype is not None},
+        engine=engine,
+        chunksize=chunksize,
+    )
+
+
 def _filter_df(df: pd.DataFrame) -> pd.DataFrame:
     # exclude failed checks
     df = df[df["checks.1.player.failed_checks"] <= 1]
@@ -148,16 +251,9 @@ def _filter_df(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-@cache
-def load_experiment_data(file_name: str) -> pd.DataFrame:
-    df_raw = pd.read_csv(RAW_DATA_DIR / file_name)
-    df_raw = _filter_df(df_raw)
-    df_raw.to_csv(RAW_DATA_DIR / "df_cleaned.csv", index=False)
-
-    case_df = pd.read_csv(RAW_DATA_DIR / "tasks_main_trials.csv")
-
-    example_trials_df = construct_trial_level_variables(_extract_trials(df_raw, "example_trials", case_df))
-    main_trials_df = construct_trial_level_variables(_extract_trials(df_raw, "main_trials", case_df))
+def _build_experiment_frames(df_raw: pd.DataFrame, case_table: pd.DataFrame) -> tuple:
+    example_trials_df = construct_trial_level_variables(_extract_trials(df_raw, "example_trials", case_table))
+    main_trials_df = construct_trial_level_variables(_extract_trials(df_raw, "main_trials", case_table))
     control_measures_df = pd.merge(
             _extract_single_block(df_raw, "cognitive_load", "mental_load_mental"),
             _extract_single_block(df_raw, "control_measures", "age"),
@@ -173,16 +269,196 @@ def load_experiment_data(file_name: str) -> pd.DataFrame:
     )
 
 
-def load_page_time_data(file_name: str) -> pd.DataFrame:
-    df = pd.read_csv(RAW_DATA_DIR / file_name)
+class ExperimentData:
+    """Blocks of one experiment export, each built on first access.
+
+    Every block is read from the disk cache when possible and otherwise
+    derived from the filtered export, so a script that only touches
+    `main_trials` never reshapes example trials or control measures.
+    Iterating yields the blocks in the order of the former 5-tuple, which
+    keeps `main_trials_df, control_measures_df, *_ = ...` working (at the
+    cost of building every block).
+
+    Each access returns a copy-on-write snapshot: adding or overwriting
+    columns on it never changes the cached block, so no defensive
+    `.copy()` is needed before mutating or subsetting.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        use_disk_cache: bool = True,
+        engine: str = "c",
+        compact: bool = False,
+    ):
+        self.file_name = file_name
+        self.use_disk_cache = use_disk_cache
+        self.engine = engine
+        self.compact = compact
+        self._frames: dict[str, pd.DataFrame] = {}
+
+    @cached_property
+    def _cache_key(self) -> str:
+        # keyed by the raw inputs and the loader/constructor code, so the
+        # cache invalidates itself whenever either changes
+        return fingerprint([RAW_DATA_DIR / self.file_name, RAW_DATA_DIR / CASE_FILE_NAME])
+
+    @cached_property
+    def raw(self) -> pd.DataFrame:
+        return _filter_df(_read_raw_export(self.file_name, engine=self.engine))
+
+    def _load_frame(self, frame_name: str, build) -> pd.DataFrame:
+        if not self.use_disk_cache:
+            return build()
+
+        cache_name = Path(self.file_name).stem
+        frame = read_cached_frame(cache_name, self._cache_key, frame_name)
+        if frame is None:
+            frame = build()
+            write_cached_frame(cache_name, self._cache_key, frame_name, frame)
+
+        return frame
+
+    def _snapshot(self, frame_name: str, build, compactable: bool = False) -> pd.DataFrame:
+        # the built frame is kept privately; callers get a shallow copy that
+        # shares its buffers under pandas' copy-on-write and only
+        # materializes the columns they write to
+        if frame_name not in self._frames:
+            frame = self._load_frame(frame_name, build)
+            # compaction happens after the disk cache, whose entries are
+            # always the plain frames whatever `compact` is
+            self._frames[frame_name] = compact_trial_table(frame) if compactable and self.compact else frame
+
+        return self._frames[frame_name].copy(deep=False)
+
+    def _build_trials(self, prefix: str) -> pd.DataFrame:
+        return construct_trial_level_variables(_extract_trials(self.raw, prefix, load_case_table()))
+
+    def _plain_main_trials(self) -> pd.DataFrame:
+        """Uncompacted main trials for building derived frames."""
+        if not self.compact:
+            return self.main_trials
+        return self._load_frame("main_trials", lambda: self._build_trials("main_trials"))
+
+    @property
+    def main_trials(self) -> pd.DataFrame:
+        return self._snapshot("main_trials", lambda: self._build_trials("main_trials"), compactable=True)
+
+    @property
+    def example_trials(self) -> pd.DataFrame:
+        return self._snapshot("example_trials", lambda: self._build_trials("example_trials"), compactable=True)
+
+    @property
+    def control_measures(self) -> pd.DataFrame:
+        return self._snapshot(
+            "control_measures",
+            lambda: pd.merge(
+                _extract_single_block(self.raw, "cognitive_load", "mental_load_mental"),
+                _extract_single_block(self.raw, "control_measures", "age"),
+                on="participant_code"),
+        )
+
+    @property
+    def participant_stats(self) -> pd.DataFrame:
+        return self._snapshot(
+            "participant_stats",
+            lambda: create_participant_stats(self._plain_main_trials()),
+            compactable=True,
+        )
+
+    @property
+    def participants(self) -> pd.DataFrame:
+        return self._snapshot(
+            "participants",
+            lambda: _get_participants_df(self.raw),
+        )
+
+    def participant_metrics(self, metrics: dict[str, tuple[str, str]] | None = None) -> pd.DataFrame:
+        """Per-participant metrics over the main trials (see
+        `aggregate_participants`), cached next to the trial table."""
+        if metrics is None:
+            metrics = PARTICIPANT_OUTCOME_METRICS
+
+        digest = hashlib.sha256(repr(sorted(metrics.items())).encode()).hexdigest()[:12]
+        return self._snapshot(
+            f"participant_metrics-{digest}",
+            lambda: aggregate_participants(self._plain_main_trials(), metrics),
+            compactable=True,
+        )
+
+    def __iter__(self):
+        return (getattr(self, frame_name) for frame_name in EXPERIMENT_FRAMES)
+
+    def __getitem__(self, index):
+        return tuple(self)[index] if isinstance(index, slice) else getattr(self, EXPERIMENT_FRAMES[index])
+
+    def __len__(self) -> int:
+        return len(EXPERIMENT_FRAMES)
 
-    df = df.sort_values(
-        ["participant_code", "round_number", "page_index"]
-    )
 
-    df["page_time_sec"] = (
-        df.groupby(["participant_code", "round_number"])["epoch_time_completed"]
-        .diff()
-    )
+@cache
+def load_experiment_data(
+    file_name: str,
+    use_disk_cache: bool = True,
+    engine: str = "c",
+    compact: bool = False,
+) -> ExperimentData:
+    return ExperimentData(file_name, use_disk_cache=use_disk_cache, engine=engine, compact=compact)
+
 
-    return df
\ No newline at end of file
+@cache
+def _load_trials(file_name: str, columns: tuple[str, ...], prefix: str) -> pd.DataFrame:
+    df_raw = _filter_df(_read_raw_export(file_name))
+    return compute_variables(_extract_trials(df_raw, prefix, load_case_table()), columns)
+
+
+def load_trials(
+    file_name: str,
+    columns: tuple[str, ...],
+    prefix: str = "main_trials",
+) -> pd.DataFrame:
+    """Trial table with only the requested derived columns computed.
+
+    Derived variables are resolved through the variable registry, so e.g.
+    `columns=("final_correct",)` skips agreement, reliance and confidence
+    construction entirely. The table is built once per arguments; each call
+    returns a shallow copy, so callers can modify it without touching the
+    cached one.
+    """
+    return _load_trials(file_name, tuple(columns), prefix).copy(deep=False)
+
+
+def stream_experiment_data(
+    file_name: str,
+    output_dir: Path | None = None,
+    chunk_size: int = 10_000,
+) -> Path:
+    """Process a wide export chunk by chunk into a Parquet dataset per frame.
+
+    Each row of the export is one participant, so every chunk is filtered,
+    reshaped and enriched on its own and appended as one part file under
+    `<output_dir>/<frame>/`. Peak memory is bounded by `chunk_size`, not by
+    the export size. Parts are written with `cache.write_frame`, so every
+    part of a frame has the same schema; read a frame back with
+    `cache.read_frame(output_dir / frame)` (or `pd.read_parquet`, which
+    returns the position-in-set columns as Int64).
+    """
+    if output_dir is None:
+        output_dir = CACHE_DIR / f"{Path(file_name).stem}-parquet"
+
+    for frame_name in EXPERIMENT_FRAMES:
+        shutil.rmtree(output_dir / frame_name, ignore_errors=True)
+        (output_dir / frame_name).mkdir(parents=True)
+
+    case_table = load_case_table()
+
+    for chunk_idx, chunk in enumerate(_read_raw_export(file_name, chunksize=chunk_size)):
+        chunk = _filter_df(chunk)
+        if chunk.empty:
+            continue
+
+        frames = _build_experiment_frames(chunk, case_table)
+        for frame_name, frame in zip(EXPERIMENT_FRAMES, frames):
+            write_frame(frame, output_dir / frame_name / f"part-{chunk_idx:05d}.parquet", index=False)
+
+    return output_dir
\ No newline at end of file
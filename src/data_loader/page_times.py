@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from config import RAW_DATA_DIR
+
+PAGE_TIME_DTYPES = {
+    "participant_code": "str",
+    "app_name": "category",
+    "page_name": "category",
+    "round_number": "int32",
+    "page_index": "int32",
+    "epoch_time_completed": "float64",
+}
+
+
+def load_page_time_data(file_name: str) -> pd.DataFrame:
+    df = pd.read_csv(
+        RAW_DATA_DIR / file_name,
+        usecols=list(PAGE_TIME_DTYPES),
+        dtype=PAGE_TIME_DTYPES,
+    )
+
+    participant, _ = pd.factorize(df["participant_code"], sort=True)
+    order = np.lexsort((df["page_index"].to_numpy(), participant))
+
+    df = df.take(order).reset_index(drop=True)
+    participant = participant[order]
+    completed = df["epoch_time_completed"].to_numpy()
+
+    # one pass over the sorted log: a page's duration is the gap to the
+    # participant's previous page, whatever app it belongs to (oTree
+    # restarts round_number in every app, so rounds do not delimit pages)
+    page_time_sec = np.full(len(df), np.nan)
+    same_participant = participant[1:] == participant[:-1]
+    page_time_sec[1:] = np.where(same_participant, completed[1:] - completed[:-1], np.nan)
+    df["page_time_sec"] = page_time_sec
+
+    return df
+
+
+def aggregate_page_times(page_time_df: pd.DataFrame) -> pd.DataFrame:
+    """Total seconds per participant, app, round and page."""
+    return (
+        page_time_df
+        .groupby(["participant_code", "app_name", "round_number", "page_name"], observed=True)
+        ["page_time_sec"]
+        .sum(min_count=1)
+        .reset_index()
+    )
+
+
+def attach_page_times(
+    trials: pd.DataFrame,
+    page_time_df: pd.DataFrame,
+    app_name: str = "main_trials",
+) -> pd.DataFrame:
+    """Join per-page durations of `app_name` onto a trial table as
+    `page_time_<page_name>` columns, matching rounds to `trial_index`."""
+    page_times = aggregate_page_times(page_time_df)
+    page_times = page_times[page_times["app_name"] == app_name].astype({
+        "page_name": str,
+        "round_number": "int64",
+    })
+
+    wide = page_times.pivot(
+        index=["participant_code", "round_number"],
+        columns="page_name",
+        values="page_time_sec",
+    )
+    wide.columns = [f"page_time_{page}" for page in wide.columns]
+    wide.index.names = ["participant_code", "trial_index"]
+
+    return trials.join(wide, on=["participant_code", "trial_index"])
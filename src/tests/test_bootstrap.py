@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from thesis.modeling.bootstrap import cluster_bootstrap_rates
+
+
+@pytest.mark.parametrize("rate", [0.15, 0.3])
+def test_bca_matches_scipy_for_iid_rows(rate):
+    # one row per cluster, so the cluster bootstrap is the ordinary one; the
+    # bootstrapped rates are discrete and many replicates tie with the estimate
+    x = (np.random.default_rng(1).random(80) < rate).astype(float)
+    df = pd.DataFrame({"value": x, "cell": "a", "participant_code": np.arange(len(x))})
+
+    result = cluster_bootstrap_rates(df, "value", ["cell"], n_boot=20_000, ci="bca")
+    expected = stats.bootstrap((x,), np.mean, n_resamples=20_000, method="BCa", random_state=0).confidence_interval
+
+    np.testing.assert_allclose(result[["ci_lower", "ci_upper"]].to_numpy()[0], [expected.low, expected.high], atol=1 / len(x))
+
+
+@pytest.mark.parametrize("ci", ["percentile", "bca"])
+def test_rows_with_missing_group_are_dropped(ci):
+    df = pd.DataFrame({
+        "value": [1, 0, 1, 1, 0, 1, 0],
+        "cell": ["a", "a", None, "b", "b", "a", None],
+        "participant_code": [1, 1, 2, 2, 3, 3, 4],
+    })
+
+    result = cluster_bootstrap_rates(df, "value", ["cell"], n_boot=200, ci=ci)
+
+    assert result["cell"].tolist() == ["a", "b"]
+    np.testing.assert_allclose(result["rate"], [2 / 3, 1 / 2])
+    assert result["n"].tolist() == [3, 2]
+    assert np.isfinite(result[["ci_lower", "ci_upper"]].to_numpy()).all()
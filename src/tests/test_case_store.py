@@ -0,0 +1,21 @@
+import pandas as pd
+
+from data_loader import join_case_features, load_case_table, load_experiment_data
+from data_loader.case_store import feature_columns
+
+EXPORT = "all_apps_wide-2026-03-20.csv"
+
+
+def test_default_join_on_loaded_trials():
+    trials = load_experiment_data(EXPORT).main_trials
+    joined = join_case_features(trials)
+
+    case_table = load_case_table()
+    assert len(joined) == len(trials)
+    assert set(feature_columns(case_table)) <= set(joined.columns)
+    # the trials' own conformal-set columns are kept, not duplicated
+    assert not joined.columns.duplicated().any()
+    pd.testing.assert_frame_equal(joined[trials.columns], trials)
+
+    expected = case_table.loc[trials["case_id"], "cp_standard_set_size"].to_numpy()
+    assert (joined["cp_standard_set_size"].to_numpy() == expected).all()
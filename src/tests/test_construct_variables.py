@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from benchmarks.bench_construct_variables import make_trials
+from data_loader.case_store import load_case_table
+from data_loader.load_data import _extract_trials, _filter_df, _read_raw_export
+from variable_constructer import construct_trial_level_variables
+
+
+@pytest.mark.parametrize("messy", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_coded_engine_matches_pandas_engine(seed, messy):
+    # messy trials add casing/whitespace noise and missing decisions
+    trials = make_trials(20_000, seed=seed, messy=messy)
+
+    pd.testing.assert_frame_equal(
+        construct_trial_level_variables(trials, engine="coded"),
+        construct_trial_level_variables(trials, engine="pandas"),
+    )
+
+
+@pytest.mark.parametrize("prefix", ["main_trials", "example_trials"])
+def test_coded_engine_matches_pandas_engine_on_export(prefix):
+    raw = _filter_df(_read_raw_export("all_apps_wide-2026-03-20.csv"))
+    trials = _extract_trials(raw, prefix, load_case_table())
+
+    pd.testing.assert_frame_equal(
+        construct_trial_level_variables(trials, engine="coded"),
+        construct_trial_level_variables(trials, engine="pandas"),
+    )
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        construct_trial_level_variables(make_trials(10), engine="numba")
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import statsmodels.api as sm
+from scipy import special
+
+from thesis.modeling import estimators
+from thesis.modeling.estimators import fit_logit, fit_logit_batch
+
+
+@pytest.fixture
+def logit_data():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([np.ones(400), rng.normal(size=(400, 2))])
+    Y = (rng.random((3, 400)) < special.expit(X @ [0.3, 0.8, -0.5])).astype(float)
+    groups = np.repeat(np.arange(40), 10)
+    return Y, X, groups
+
+
+def test_logit_matches_statsmodels(logit_data):
+    Y, X, groups = logit_data
+    reference = sm.Logit(Y[0], X).fit(disp=False, cov_type="cluster", cov_kwds={"groups": groups})
+
+    fit = fit_logit(Y[0], X, groups)
+    params, se, converged = fit_logit_batch(Y, X, groups)
+
+    assert fit.converged and converged.all()
+    np.testing.assert_allclose(fit.params, reference.params, rtol=1e-8)
+    np.testing.assert_allclose(fit.bse, reference.bse, rtol=1e-8)
+    np.testing.assert_allclose(params[0], reference.params, rtol=1e-6)
+    np.testing.assert_allclose(se[0], reference.bse, rtol=1e-6)
+
+
+@pytest.fixture
+def failing_line_search(monkeypatch):
+    """Log-likelihood that rejects every move away from the zero start."""
+    llf = estimators._logit_llf
+    monkeypatch.setattr(
+        estimators,
+        "_logit_llf",
+        lambda y, eta, weights: np.where(np.all(eta == 0, axis=-1), llf(y, eta, weights), -np.inf),
+    )
+
+
+def test_exhausted_line_search_is_not_converged(logit_data, failing_line_search):
+    Y, X, groups = logit_data
+
+    fit = fit_logit(Y[0], X, groups)
+
+    assert not fit.converged
+    assert fit.n_iter == 1
+    # the last accepted estimates and their log-likelihood, still in sync
+    np.testing.assert_array_equal(fit.params, 0)
+    assert fit.llf == pytest.approx(-len(Y[0]) * np.log(2))
+
+
+def test_exhausted_line_search_is_not_converged_in_batch(logit_data, failing_line_search):
+    Y, X, groups = logit_data
+
+    params, se, converged = fit_logit_batch(Y, X, groups)
+
+    assert not converged.any()
+    assert np.isnan(params).all() and np.isnan(se).all()
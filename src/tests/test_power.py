@@ -0,0 +1,18 @@
+import pytest
+
+from thesis.modeling.power import power_analysis
+
+EFFECTS = [{"C2": 0.3, "C3": 0.6}]
+
+
+def test_any_left_hand_side():
+    kwargs = dict(n_replicates=40, chunk_size=20)
+    chapter = power_analysis([20], EFFECTS, formula="final_correct ~ C(condition) + C(case_id)", **kwargs)
+    placeholder = power_analysis([20], EFFECTS, formula="outcome ~ C(condition) + C(case_id)", **kwargs)
+
+    assert chapter.equals(placeholder)
+
+
+def test_formula_without_tilde():
+    with pytest.raises(ValueError, match="C\\(condition\\)"):
+        power_analysis([20], EFFECTS, formula="C(condition)")
@@ -0,0 +1,37 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from data_loader import load_experiment_data, stream_experiment_data
+from data_loader.cache import read_frame
+from data_loader.load_data import EXPERIMENT_FRAMES
+
+EXPORT = "all_apps_wide-2026-03-20.csv"
+
+
+@pytest.fixture(scope="module")
+def streamed(tmp_path_factory):
+    # small chunks, so some of them have no C3 trials and all-missing
+    # position-in-set columns
+    return stream_experiment_data(EXPORT, tmp_path_factory.mktemp("stream"), chunk_size=20)
+
+
+@pytest.mark.parametrize("frame_name", EXPERIMENT_FRAMES)
+def test_parts_share_one_schema(streamed, frame_name):
+    parts = sorted((streamed / frame_name).iterdir())
+    assert len(parts) > 1
+    schemas = [pq.read_schema(part).remove_metadata() for part in parts]
+    assert all(schema.equals(schemas[0]) for schema in schemas)
+
+
+@pytest.mark.parametrize("frame_name", EXPERIMENT_FRAMES)
+def test_stream_round_trip(streamed, frame_name):
+    expected = getattr(load_experiment_data(EXPORT), frame_name)
+    result = read_frame(streamed / frame_name)
+    if frame_name == "participant_stats":
+        # aggregated per chunk, so participants are sorted within each part only
+        expected = expected.sort_values("participant_code")
+        result = result.sort_values("participant_code")
+
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+    assert len(pd.read_parquet(streamed / frame_name)) == len(expected)
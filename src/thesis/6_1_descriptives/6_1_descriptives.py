@@ -1,128 +1,74 @@
-from scipy.stats import kruskal
 import pandas as pd
-from scipy.stats import chi2_contingency
 
 from data_loader import load_experiment_data
 from thesis.figure_creation import plot_switching_rate
+from thesis.modeling import balance_table
 
+NUMERIC_COVARIATES = [
+    "age",
+    "ai_literacy_sk9",
+    "ai_literacy_sk10",
+    "ai_literacy_ail2",
+    "ai_literacy_ue2",
+    "risk_aversion"
+]
 
-def balance_test_across_conditions(df: pd.DataFrame):
-    rows = []
-
-    numeric_cols = [
-        "age",
-        "ai_literacy_sk9",
-        "ai_literacy_sk10",
-        "ai_literacy_ail2",
-        "ai_literacy_ue2",
-        "risk_aversion"
-    ]
-
-    for var in numeric_cols:
-        row = {"variable": var}
+CATEGORICAL_COVARIATES = ["gender", "education", "domain_experience"]
 
-        groups = []
-        for cond in ["C1", "C2", "C3"]:
-            data = df[df["condition"] == cond][var].dropna()
-            row[cond] = f"{data.mean():.2f} ({data.std():.2f})"
-            groups.append(data)
 
-        stat, p = kruskal(*groups)
-        row["test"] = f"H={stat:.2f}"
-        row["p"] = f"{p:.4f}"
+def balance_test_across_conditions(balance: pd.DataFrame, conditions=("C1", "C2", "C3")):
+    """Formats `balance_table` output: mean (sd) or count (%) per condition,
+    the test, its raw and Holm-adjusted p-value and the largest |SMD|."""
+    rows = []
 
+    for _, result in balance.iterrows():
+        if result["test"] == "kruskal":
+            row = {"variable": result["variable"]}
+            for cond in conditions:
+                row[cond] = f"{result[f'mean_{cond}']:.2f} ({result[f'sd_{cond}']:.2f})"
+            row["test"] = f"H={result['statistic']:.2f}"
+        else:
+            row = {"variable": f"{result['variable']}: {result['level']}"}
+            for cond in conditions:
+                row[cond] = f"{result[f'n_{cond}']} ({result[f'mean_{cond}'] * 100:.1f}%)"
+            row["test"] = f"Chi2={result['statistic']:.2f}"
+
+        row["p"] = f"{result['p_value']:.4f}"
+        row["p_holm"] = f"{result['p_adjusted']:.4f}"
+        row["max_smd"] = f"{result['max_abs_smd']:.2f}"
         rows.append(row)
 
-    categorical_vars = ["gender", "education", "domain_experience"]
-
-    for var in categorical_vars:
-        contingency = pd.crosstab(df[var], df["condition"])
-        percent = contingency.div(contingency.sum(axis=0), axis=1) * 100
-
-        chi2, p, dof, _ = chi2_contingency(contingency)
-
-        for category in contingency.index:
-            row = {"variable": f"{var}: {category}"}
-
-            for cond in ["C1", "C2", "C3"]:
-                count = contingency.loc[category, cond]
-                perc = percent.loc[category, cond]
-                row[cond] = f"{count} ({perc:.1f}%)"
-
-            row["test"] = f"Chi2={chi2:.2f}"
-            row["p"] = f"{p:.4f}"
-
-            rows.append(row)
-
     return pd.DataFrame(rows)
 
-def print_control_measures(df: pd.DataFrame):
-    numeric_cols = [
-        "age",
-        "ai_literacy_sk9",
-        "ai_literacy_sk10",
-        "ai_literacy_ail2",
-        "ai_literacy_ue2",
-        "risk_aversion"
-    ]
-
+def print_control_measures(df: pd.DataFrame, balance: pd.DataFrame):
     with pd.option_context(
             "display.max_rows", None,
             "display.max_columns", None
     ):
-        print(df[numeric_cols].describe())
-
-    gender_counts = df["gender"].value_counts(dropna=False)
-    gender_percent = df["gender"].value_counts(dropna=False, normalize=True) * 100
-    gender_summary = pd.DataFrame({
-        "count": gender_counts,
-        "percent": gender_percent
-    })
-    print(gender_summary)
-
-    education_counts = df["education"].value_counts(dropna=False)
-    education_percent = df["education"].value_counts(dropna=False, normalize=True) * 100
-    education_summary = pd.DataFrame({
-        "count": education_counts,
-        "percent": education_percent
-    })
-    print(education_summary)
-
-    domain_experience_counts = df["domain_experience"].value_counts(dropna=False)
-    domain_experience_percent = df["domain_experience"].value_counts(dropna=False, normalize=True) * 100
-    domain_experience_summary = pd.DataFrame({
-        "count": domain_experience_counts,
-        "percent": domain_experience_percent
-    })
-    print(domain_experience_summary)
-
-    for var in numeric_cols:
-        groups = [
-            df[df["condition"] == "C1"][var],
-            df[df["condition"] == "C2"][var],
-            df[df["condition"] == "C3"][var]
-        ]
+        print(df[NUMERIC_COVARIATES].describe())
 
-        stat, p = kruskal(*groups)
-        print(f"{var}: H={stat:.3f}, p={p:.3f}")
+    for var in CATEGORICAL_COVARIATES:
+        counts = df[var].value_counts(dropna=False)
+        percent = df[var].value_counts(dropna=False, normalize=True) * 100
+        print(pd.DataFrame({
+            "count": counts,
+            "percent": percent
+        }))
 
-    categorical_vars = ["gender", "education", "domain_experience"]
+    tests = balance.drop_duplicates("variable")
+    for _, result in tests[tests["test"] == "kruskal"].iterrows():
+        print(f"{result['variable']}: H={result['statistic']:.3f}, p={result['p_value']:.3f}")
 
-    for var in categorical_vars:
-        contingency = pd.crosstab(df[var], df["condition"])
-        chi2, p, dof, _ = chi2_contingency(contingency)
-
-        print(f"{var}: chi2={chi2:.3f}, p={p:.3f}")
+    for _, result in tests[tests["test"] == "chi2"].iterrows():
+        print(f"{result['variable']}: chi2={result['statistic']:.3f}, p={result['p_value']:.3f}")
 
 
 if __name__ == '__main__':
     experiment_date = "2026-03-20"
-    (
-        main_trials_df,
-        control_measures_df,
-        participants_df,
-        *_
-    ) = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    data = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    main_trials_df = data.main_trials
+    control_measures_df = data.control_measures
+    participants_df = data.participant_stats
 
     condition_df = (
         main_trials_df
@@ -145,11 +91,11 @@ if __name__ == '__main__':
 
     mismatch_df = main_trials_df[
         main_trials_df["initial_agree_ai"] == 0
-        ].copy()
+        ]
 
     top1_mismatch_df = main_trials_df[
         main_trials_df["initial_top_1_agree"] == 0
-        ].copy()
+        ]
 
     print("=== Participants and Trials per Condition ===")
     summary = participants_df.groupby('condition')['participant_code'].describe()
@@ -207,14 +153,15 @@ if __name__ == '__main__':
     print(main_trials_df.groupby('condition')['shared_ai_confidence'].describe())
 
     print("=== Control Measures ===")
+    balance = balance_table(control_measures_df, NUMERIC_COVARIATES, CATEGORICAL_COVARIATES)
     print("> Full set distribution")
-    print_control_measures(control_measures_df)
+    print_control_measures(control_measures_df, balance)
     print("> Balance Checks across conditions")
     with pd.option_context(
             "display.max_rows", None,
             "display.max_columns", None
     ):
-        print(balance_test_across_conditions(control_measures_df))
+        print(balance_test_across_conditions(balance))
 
     print("=== AI Attitude ===")
     print("> by Condition")
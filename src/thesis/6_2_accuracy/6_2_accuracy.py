@@ -1,14 +1,14 @@
-from data_loader import load_experiment_data
+from data_loader import load_trials
 import statsmodels.formula.api as smf
 
 from thesis.figure_creation import plot_initial_final_accuracy_per_condition
 
 if __name__ == '__main__':
     experiment_date = "2026-03-20"
-    (
-        main_trials_df,
-        *_
-    ) = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    main_trials_df = load_trials(
+        f"all_apps_wide-{experiment_date}.csv",
+        columns=("initial_correct", "final_correct"),
+    )
 
     print("=== Accuracy Descriptives ===")
     print(main_trials_df.groupby('condition')['initial_correct'].describe())
@@ -9,18 +9,15 @@ from thesis.figure_creation.bar_chart import plot_calibration_switching
 
 if __name__ == '__main__':
     experiment_date = "2026-03-20"
-    (
-        main_trials_df,
-        *_
-    ) = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
 
     mismatch_df = main_trials_df[
         main_trials_df["initial_agree_ai"] == 0
-        ].copy()
+        ]
 
     top1_mismatch_df = main_trials_df[
         main_trials_df["initial_top_1_agree"] == 0
-        ].copy()
+        ]
 
     print("=== Switching Descriptives (Full df) ===")
     print(main_trials_df.groupby('condition')['switched'].describe())
@@ -65,7 +62,7 @@ if __name__ == '__main__':
     print("=== C3: Switching is directed to Top-1 ===")
     c3_switched = main_trials_df[
         (main_trials_df["switched"] == 1) & (main_trials_df["condition"] == "C3")
-        ].copy()
+        ]
     c3_switched["moved_to_top1"] = (c3_switched["final_pos_in_set"] == 1).astype(int)
     print(c3_switched["moved_to_top1"].mean())
 
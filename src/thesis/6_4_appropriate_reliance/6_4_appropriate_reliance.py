@@ -1,59 +1,51 @@
-import statsmodels.formula.api as smf
-
 from data_loader import load_experiment_data
 from thesis.figure_creation.bar_chart import plot_calibration_switching, plot_reliance_comparison
+from thesis.modeling import ModelSpec, run_model_batch
 
 
 
-def run_reliance_analysis(
-    df,
+def reliance_spec(
     title: str,
     dependent_var: str,
-    subset_condition=None,
-):
-    print(f"=== {title} ===")
-
-    analysis_df = df if subset_condition is None else df[subset_condition(df)]
+    subset: str | None = None,
+) -> ModelSpec:
+    return ModelSpec(
+        formula=f"{dependent_var} ~ C(condition) + C(case_id)",
+        subset=subset,
+        name=title,
+    )
 
-    print(analysis_df.groupby("condition")[dependent_var].mean())
 
-    model = smf.logit(
-        f"{dependent_var} ~ C(condition) + C(case_id)",
-        data=analysis_df
-    )
+def print_reliance_analysis(df, result) -> None:
+    print(f"=== {result.spec.name} ===")
 
-    result = model.fit(
-        cov_type="cluster",
-        cov_kwds={"groups": analysis_df["participant_code"]},
-        disp=False
-    )
+    analysis_df = df if result.spec.subset is None else df.query(result.spec.subset)
+    dependent_var = result.spec.formula.split("~")[0].strip()
 
-    print(result.summary())
+    print(analysis_df.groupby("condition")[dependent_var].mean())
+    print(result.summary)
 
 
 if __name__ == '__main__':
     experiment_date = "2026-03-20"
-    (
-        main_trials_df,
-        *_
-    ) = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
 
     reliance_column = "final_agree_ai"
     main_trials_df[reliance_column] = main_trials_df[reliance_column].astype(int)
     mismatch_df = main_trials_df[
         main_trials_df["initial_agree_ai"] == 0
-        ].copy()
+        ]
 
     analyses = [
         {
             "title": "Overreliance",
             "dependent_var": reliance_column,
-            "subset": lambda d: d["ai_correct"] == False,
+            "subset": "ai_correct == 0",
         },
         {
             "title": "Underreliance",
             "dependent_var": "final_agree_ai",
-            "subset": lambda d: d["ai_correct"] == True,
+            "subset": "ai_correct == 1",
         },
         {
             "title": "Appropriate Reliance",
@@ -62,23 +54,28 @@ if __name__ == '__main__':
         },
     ]
 
-    print("=== All Conditions ===")
-    for analysis in analyses:
-        run_reliance_analysis(
-            df=mismatch_df,
-            title=analysis["title"],
-            dependent_var=analysis["dependent_var"],
-            subset_condition=analysis["subset"],
+    # all six fits (three analyses on all conditions and on C2 vs. C3) run
+    # as one batch
+    c2_c3_subset = "condition in ['C2', 'C3']"
+    specs = [
+        reliance_spec(analysis["title"], analysis["dependent_var"], analysis["subset"])
+        for analysis in analyses
+    ] + [
+        reliance_spec(
+            analysis["title"],
+            analysis["dependent_var"],
+            " and ".join(filter(None, [c2_c3_subset, analysis["subset"]])),
         )
+        for analysis in analyses
+    ]
+    results = run_model_batch(mismatch_df, specs)
+
+    print("=== All Conditions ===")
+    for result in results[:len(analyses)]:
+        print_reliance_analysis(mismatch_df, result)
 
     print("=== C2 vs. C3 comparison (worst vs. best) ===")
-    c2_c3_df = mismatch_df[mismatch_df["condition"].isin(["C2", "C3"])]
-    for analysis in analyses:
-        run_reliance_analysis(
-            df=c2_c3_df,
-            title=analysis["title"],
-            dependent_var=analysis["dependent_var"],
-            subset_condition=analysis["subset"],
-        )
+    for result in results[len(analyses):]:
+        print_reliance_analysis(mismatch_df, result)
 
     plot_reliance_comparison(mismatch_df, "over_reliance", "appropriate_reliance")
@@ -1,18 +1,18 @@
+import pandas as pd
+
 from data_loader import load_experiment_data
 import statsmodels.formula.api as smf
 
 from thesis.figure_creation.line_chart import plot_switching_vs_confidence_gap
+from thesis.modeling import marginal_effects_batch
 
 if __name__ == '__main__':
     experiment_date = "2026-03-20"
-    (
-        main_trials_df,
-        *_
-    ) = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    main_trials_df = load_experiment_data(f"all_apps_wide-{experiment_date}.csv").main_trials
 
     top1_mismatch_df = main_trials_df[
         main_trials_df["initial_top_1_agree"] == 0
-        ].copy()
+        ]
 
 
     print("=== Switching Descriptives (Full df) ===")
@@ -20,6 +20,8 @@ if __name__ == '__main__':
     print("=== Switching Descriptives (Top 1 mismatch df) ===")
     print(top1_mismatch_df.groupby('condition')['switched'].describe())
 
+    models = {}
+
     print(f"\n=== Switched by shared_ai_confidence * Condition ===")
     model = smf.logit(
         f"switched ~ shared_ai_confidence * C(condition)",
@@ -29,6 +31,7 @@ if __name__ == '__main__':
         cov_kwds={"groups": top1_mismatch_df["participant_code"]}
     )
     print(model.summary())
+    models["shared_ai_confidence"] = model
 
     print(f"\n=== Switched by initial_confidence * Condition ===")
     model = smf.logit(
@@ -39,6 +42,7 @@ if __name__ == '__main__':
         cov_kwds={"groups": top1_mismatch_df["participant_code"]}
     )
     print(model.summary())
+    models["initial_confidence"] = model
 
     print(f"\n=== Switched by Confidence Gap * Condition ===")
     model = smf.logit(
@@ -49,5 +53,14 @@ if __name__ == '__main__':
         cov_kwds={"groups": top1_mismatch_df["participant_code"]}
     )
     print(model.summary())
+    models["confidence_gap"] = model
+
+    print(f"\n=== Average Marginal Effects by Condition (probability scale) ===")
+    with pd.option_context(
+            "display.max_rows", None,
+            "display.max_columns", None,
+            "display.width", 200
+    ):
+        print(marginal_effects_batch(models, by="condition"))
 
     plot_switching_vs_confidence_gap(model, top1_mismatch_df)
\ No newline at end of file
@@ -3,11 +3,9 @@ import statsmodels.formula.api as smf
 
 if __name__ == '__main__':
     experiment_date = "2026-03-20"
-    (
-        main_trials_df,
-        control_measures_df,
-        *_
-    ) = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    data = load_experiment_data(f"all_apps_wide-{experiment_date}.csv")
+    main_trials_df = data.main_trials
+    control_measures_df = data.control_measures
 
     condition_df = (
         main_trials_df
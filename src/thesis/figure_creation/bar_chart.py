@@ -3,17 +3,26 @@ import pandas as pd
 import numpy as np
 from matplotlib.patches import FancyBboxPatch, Rectangle
 
+from thesis.modeling.bootstrap import cluster_bootstrap_rates
 
-def get_statistics_by_condition(
+
+def _rate_statistics(
     df: pd.DataFrame,
     col: str,
-    condition_col: str = "condition",
-):
-    agg_df = df[[condition_col, col]].copy()
-    agg_df[col] = pd.to_numeric(agg_df[col], errors="coerce")
+    group_cols: list[str],
+    ci: str = "wald",
+    cluster_col: str = "participant_code",
+    strata_col: str | None = None,
+    n_boot: int = 2000,
+    seed: int = 0,
+) -> pd.DataFrame:
+    if ci != "wald":
+        return cluster_bootstrap_rates(
+            df, col, group_cols, cluster_col, strata_col, n_boot=n_boot, ci=ci, seed=seed
+        )
 
     agg = (
-        agg_df.groupby(condition_col)[col]
+        df.groupby(group_cols)[col]
         .agg(['mean', 'count'])
         .reset_index()
         .rename(columns={'mean': 'rate', 'count': 'n'})
@@ -27,12 +36,25 @@ def get_statistics_by_condition(
 
     return agg
 
-    z = 1.96
-    agg["se"] = np.sqrt(agg["rate"] * (1 - agg["rate"]) / agg["n"])
-    agg["ci_lower"] = (agg["rate"] - z * agg["se"]).clip(0, 1)
-    agg["ci_upper"] = (agg["rate"] + z * agg["se"]).clip(0, 1)
 
-    return agg
+def get_statistics_by_condition(
+    df: pd.DataFrame,
+    col: str,
+    condition_col: str = "condition",
+    ci: str = "wald",
+    cluster_col: str = "participant_code",
+    n_boot: int = 2000,
+    seed: int = 0,
+):
+    """Rate of `col` per condition with 95% intervals.
+
+    `ci="wald"` gives trial-level Wald intervals; "percentile" or "bca" give
+    participant cluster bootstrap intervals, resampling within conditions.
+    """
+    agg_df = df[[condition_col, col] + ([cluster_col] if ci != "wald" else [])]
+    agg_df[col] = pd.to_numeric(agg_df[col], errors="coerce")
+
+    return _rate_statistics(agg_df, col, [condition_col], ci, cluster_col, condition_col, n_boot, seed)
 
 
 def plot_binary_rate_per_condition(
@@ -40,8 +62,9 @@ def plot_binary_rate_per_condition(
     column: str,
     condition_col: str = "condition",
     y_label: str | None = None,
+    ci: str = "wald",
 ):
-    agg = get_statistics_by_condition(df, column, condition_col)
+    agg = get_statistics_by_condition(df, column, condition_col, ci)
 
     plt.rcParams.update({
         "font.family": "sans-serif",
@@ -120,9 +143,10 @@ def plot_initial_final_accuracy_per_condition(
     condition_col: str = "condition",
     title: str | None = None,
     y_label: str | None = None,
+    ci: str = "wald",
 ):
-    agg_init = get_statistics_by_condition(df, initial_col, condition_col)
-    agg_final = get_statistics_by_condition(df, final_col, condition_col)
+    agg_init = get_statistics_by_condition(df, initial_col, condition_col, ci)
+    agg_final = get_statistics_by_condition(df, final_col, condition_col, ci)
 
     plt.rcParams.update({
         "font.family": "sans-serif",
@@ -249,9 +273,10 @@ def plot_reliance_comparison(
     appropriate_col: str,
     condition_col: str = "condition",
     y_label: str = "Reliance Rate",
+    ci: str = "wald",
 ):
-    over = get_statistics_by_condition(df, over_col, condition_col)
-    app = get_statistics_by_condition(df, appropriate_col, condition_col)
+    over = get_statistics_by_condition(df, over_col, condition_col, ci)
+    app = get_statistics_by_condition(df, appropriate_col, condition_col, ci)
 
     plt.rcParams.update({
         "font.family": "sans-serif",
@@ -359,7 +384,7 @@ def plot_switching_rate(
 ):
     label_map = {0: "Match", 1: "Mismatch"}
 
-    df = df.copy()
+    df = df.copy(deep=False)
     df[group_col] = df[group_col].map(label_map)
 
     counts = (
@@ -504,25 +529,19 @@ def plot_calibration_switching(
     switch_col: str,       # 1 = switched
     condition_col: str = "condition",
     y_label: str | None = None,
+    ci: str = "wald",
+    cluster_col: str = "participant_code",
 ):
-    df = df.copy()
+    df = df.copy(deep=False)
     df["ai_correct_label"] = df[ai_correct_col].map({
         1: "Correct",
         0: "Incorrect"
     })
 
-    agg = (
-        df.groupby([condition_col, "ai_correct_label"])[switch_col]
-        .agg(['mean', 'count'])
-        .reset_index()
-        .rename(columns={'mean': 'rate', 'count': 'n'})
+    agg = _rate_statistics(
+        df, switch_col, [condition_col, "ai_correct_label"], ci, cluster_col, condition_col
     )
 
-    z = 1.96
-    agg["se"] = np.sqrt(agg["rate"] * (1 - agg["rate"]) / agg["n"])
-    agg["ci_lower"] = (agg["rate"] - z * agg["se"]).clip(0, 1)
-    agg["ci_upper"] = (agg["rate"] + z * agg["se"]).clip(0, 1)
-
     correctness_order = ["Incorrect", "Correct"]
     conditions = sorted(agg[condition_col].unique())
 
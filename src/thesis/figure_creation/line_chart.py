@@ -2,6 +2,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from thesis.modeling.prediction import prediction_grid
+
 
 def plot_switching_vs_confidence_gap(
     model,
@@ -12,34 +14,12 @@ def plot_switching_vs_confidence_gap(
 ):
 
     x_vals = np.linspace(-1, 1, 200)
+    conditions = sorted(df[condition_col].dropna().unique())
 
-    condition_value = df[condition_col].iloc[0]
-
-    pred_df = pd.DataFrame({
-        confidence_col: x_vals,
-        condition_col: condition_value
-    })
-
-    pred_res = model.get_prediction(pred_df).summary_frame(alpha=0.05)
-
-    def find_col(cols, keywords):
-        for c in cols:
-            if any(k in c for k in keywords):
-                return c
-        raise ValueError(f"Could not find column with keywords {keywords} in {cols}")
-
-    cols = pred_res.columns
-
-    mean_col = find_col(cols, ["mean", "predicted"])
-    lower_col = find_col(cols, ["lower"])
-    upper_col = find_col(cols, ["upper"])
-
-    pred_df["mean"] = pred_res[mean_col]
-    pred_df["ci_lower"] = pred_res[lower_col]
-    pred_df["ci_upper"] = pred_res[upper_col]
-    pred_df[["mean", "ci_lower", "ci_upper"]] = pred_df[
-        ["mean", "ci_lower", "ci_upper"]
-    ].clip(0, 1)
+    # one curve per condition, with pointwise (shaded) and simultaneous (dashed) 95% bands
+    pred_df = prediction_grid(model, {condition_col: conditions, confidence_col: x_vals})
+    band_cols = ["mean", "ci_lower", "ci_upper", "band_lower", "band_upper"]
+    pred_df = pred_df.assign(**pred_df[band_cols].clip(0, 1))
 
     plt.rcParams.update({
         "font.family": "sans-serif",
@@ -52,27 +32,38 @@ def plot_switching_vs_confidence_gap(
 
     fig, ax = plt.subplots(figsize=(7, 4.5))
 
-    line_color = "#593032"
-    ci_color = "#6F8489"
-
-    ax.plot(
-        pred_df[confidence_col],
-        pred_df["mean"],
-        color=line_color,
-        linewidth=2.5
-    )
-
-    for i in range(len(pred_df)):
-        ax.vlines(
-            pred_df[confidence_col].iloc[i],
-            pred_df["ci_lower"].iloc[i],
-            pred_df["ci_upper"].iloc[i],
-            colors=ci_color,
-            linewidth=2,
+    colors = ["#AFC3C2", "#6F8489", "#3E5C61"]  # C1, C2, C3
+
+    for j, condition in enumerate(conditions):
+        curve = pred_df[pred_df[condition_col] == condition]
+        color = colors[j % len(colors)]
+
+        ax.plot(
+            curve[confidence_col],
+            curve["mean"],
+            color=color,
+            linewidth=2.5,
+            label=condition
+        )
+
+        ax.fill_between(
+            curve[confidence_col],
+            curve["ci_lower"],
+            curve["ci_upper"],
+            color=color,
             alpha=0.25,
-            capstyle="round"
+            linewidth=0
         )
 
+        for bound in ["band_lower", "band_upper"]:
+            ax.plot(
+                curve[confidence_col],
+                curve[bound],
+                color=color,
+                linewidth=1,
+                linestyle="--"
+            )
+
     ax.tick_params(axis='x', pad=5)
     ax.tick_params(axis='y', pad=5)
 
@@ -91,13 +82,7 @@ def plot_switching_vs_confidence_gap(
     ax.grid(axis="y", linestyle="-", alpha=0.2)
     ax.set_axisbelow(True)
 
-    ax.fill_between(
-        pred_df[confidence_col],
-        pred_df["ci_lower"],
-        pred_df["ci_upper"],
-        color=ci_color,
-        alpha=0.25
-    )
+    ax.legend(frameon=False)
 
     plt.tight_layout()
     plt.show()
\ No newline at end of file
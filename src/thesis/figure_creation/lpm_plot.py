@@ -3,29 +3,23 @@ import numpy as np
 import pandas as pd
 from matplotlib.patches import FancyBboxPatch
 
+from thesis.modeling.prediction import prediction_grid
+
 
 def plot_predicted_accuracy_lpm_ci(
     model,
     title: str | None = None,
+    condition_col: str = "condition",
 ):
 
-    condition_value = model.model.data.frame["condition"].iloc[0]
-
-    pred_df = pd.DataFrame({
-        "switched": [0, 1, 0, 1],
-        "top1_correct": [0, 0, 1, 1],
-        "condition": [condition_value] * 4
+    # every switched x top1_correct cell for every condition, one panel per condition
+    pred_df = prediction_grid(model, {
+        condition_col: None,
+        "top1_correct": [0, 1],
+        "switched": [0, 1],
     })
-
-    pred_res = model.get_prediction(pred_df).summary_frame(alpha=0.05)
-
-    pred_df["mean"] = pred_res["mean"]
-    pred_df["ci_lower"] = pred_res["mean_ci_lower"]
-    pred_df["ci_upper"] = pred_res["mean_ci_upper"]
-
-    pred_df[["mean", "ci_lower", "ci_upper"]] = pred_df[
-        ["mean", "ci_lower", "ci_upper"]
-    ].clip(0, 1)
+    pred_df = pred_df.assign(**pred_df[["mean", "ci_lower", "ci_upper"]].clip(0, 1))
+    conditions = list(pd.unique(pred_df[condition_col]))
 
     pred_df["AI"] = pred_df["top1_correct"].map({
         0: "Incorrect",
@@ -53,8 +47,31 @@ def plot_predicted_accuracy_lpm_ci(
         "axes.spines.bottom": False,
     })
 
-    fig, ax = plt.subplots(figsize=(7, 4.5))
+    fig, axes = plt.subplots(1, len(conditions), figsize=(4 * len(conditions), 4.5), sharey=True, squeeze=False)
+
+    for ax, condition in zip(axes[0], conditions):
+        _draw_condition_panel(ax, pred_df[pred_df[condition_col] == condition], categories, x, bar_width, init_color, final_color, ci_color)
+        ax.set_title(condition)
+
+    axes[0, 0].set_ylabel("Predicted Probability of Correct Decision")
+
+    if title:
+        fig.suptitle(title)
+
+    axes[0, -1].legend(
+        handles=[
+            plt.Rectangle((0, 0), 1, 1, color=init_color),
+            plt.Rectangle((0, 0), 1, 1, color=final_color),
+        ],
+        labels=["Not Switched", "Switched"],
+        frameon=False
+    )
+
+    plt.tight_layout()
+    plt.show()
+
 
+def _draw_condition_panel(ax, pred_df: pd.DataFrame, categories, x, bar_width, init_color, final_color, ci_color):
     for i, cat in enumerate(categories):
         subset = pred_df[pred_df["AI"] == cat]
 
@@ -101,25 +118,9 @@ def plot_predicted_accuracy_lpm_ci(
     ax.set_xticks(x)
     ax.set_xticklabels(categories)
 
-    ax.set_ylabel("Predicted Probability of Correct Decision")
     ax.set_xlabel("AI Correctness (Top-1)")
 
-    if title:
-        ax.set_title(title, pad=12)
-
     ax.tick_params(axis='y', length=0)
     ax.tick_params(axis='x', length=0)
     ax.grid(axis="y", linestyle="-", alpha=0.2)
-    ax.set_axisbelow(True)
-
-    ax.legend(
-        handles=[
-            plt.Rectangle((0, 0), 1, 1, color=init_color),
-            plt.Rectangle((0, 0), 1, 1, color=final_color),
-        ],
-        labels=["Not Switched", "Switched"],
-        frameon=False
-    )
-
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    ax.set_axisbelow(True)
\ No newline at end of file
@@ -0,0 +1,30 @@
+from .balance import balance_table
+from .bootstrap import cluster_bootstrap_rates
+from .design_cache import clear_design_cache, model_matrices
+from .estimators import ClusteredFit, fit_logit, fit_ols
+from .marginal_effects import marginal_effects, marginal_effects_batch
+from .model_batch import ModelResult, ModelSpec, fit_model, run_model_batch
+from .permutation import permutation_test
+from .power import power_analysis, simulate_trials
+from .prediction import clear_prediction_cache, prediction_grid
+
+__all__ = [
+    "ClusteredFit",
+    "ModelResult",
+    "ModelSpec",
+    "balance_table",
+    "clear_design_cache",
+    "clear_prediction_cache",
+    "cluster_bootstrap_rates",
+    "fit_logit",
+    "fit_model",
+    "fit_ols",
+    "marginal_effects",
+    "marginal_effects_batch",
+    "model_matrices",
+    "permutation_test",
+    "power_analysis",
+    "prediction_grid",
+    "run_model_batch",
+    "simulate_trials",
+]
\ No newline at end of file
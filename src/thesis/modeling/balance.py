@@ -0,0 +1,163 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from statsmodels.stats.multitest import multipletests
+
+
+def _kruskal_wallis(values: np.ndarray, indicators: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Tie-corrected Kruskal-Wallis H of every column of `values` (rows x
+    variables) across the conditions in `indicators` (rows x conditions).
+
+    Ranks are computed per column ignoring missing values; the rank sums per
+    condition are one matrix product and the tie correction follows from the
+    sum of squared average ranks, sum(r^2) = N(N+1)(2N+1)/6 - sum(t^3 - t)/12.
+    """
+    observed = ~np.isnan(values)
+    ranks = np.nan_to_num(stats.rankdata(values, axis=0, nan_policy="omit"))
+
+    n = indicators.T @ observed
+    rank_sums = indicators.T @ ranks
+    total = n.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        h = 12 / (total * (total + 1)) * (rank_sums ** 2 / n).sum(axis=0, where=n > 0) - 3 * (total + 1)
+        ties = 12 * (total * (total + 1) * (2 * total + 1) / 6 - (ranks ** 2).sum(axis=0))
+        h /= 1 - ties / (total ** 3 - total)
+
+    dof = (n > 0).sum(axis=0) - 1
+    return h, dof, stats.chi2.sf(h, dof)
+
+
+def _chi2_independence(counts: np.ndarray, blocks: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pearson chi-square tests of the stacked contingency tables in `counts`
+    (levels x conditions), one table per run of equal `blocks`. Conditions
+    absent from a table are dropped and 2x2 tables get Yates' correction,
+    as in `scipy.stats.chi2_contingency`."""
+    starts = np.flatnonzero(np.r_[True, blocks[1:] != blocks[:-1]])
+    column_totals = np.add.reduceat(counts, starts, axis=0)
+    row_totals = counts.sum(axis=1, keepdims=True)
+    table_totals = column_totals.sum(axis=1, keepdims=True)
+
+    expected = row_totals * column_totals[blocks] / table_totals[blocks]
+    n_rows = np.diff(np.r_[starts, len(blocks)])
+    dof = (n_rows - 1) * ((column_totals > 0).sum(axis=1) - 1)
+
+    deviation = counts - expected
+    yates = (dof == 1)[blocks, None]
+    deviation = np.where(yates, np.sign(deviation) * np.maximum(np.abs(deviation) - 0.5, 0), deviation)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cells = np.where(expected > 0, deviation ** 2 / expected, 0)
+    statistic = np.add.reduceat(cells.sum(axis=1), starts)
+    return statistic, dof, stats.chi2.sf(statistic, dof)
+
+
+def _pairwise_smd(means: np.ndarray, variances: np.ndarray, pairs: list[tuple[int, int]]) -> np.ndarray:
+    """(rows x pairs) standardized mean differences, each difference scaled
+    by the root of the average variance of the two conditions."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.stack([
+            (means[:, b] - means[:, a]) / np.sqrt((variances[:, a] + variances[:, b]) / 2)
+            for a, b in pairs
+        ], axis=1)
+
+
+def balance_table(
+    df: pd.DataFrame,
+    numeric_cols: list[str] = (),
+    categorical_cols: list[str] = (),
+    condition_col: str = "condition",
+    correction: str | None = "holm",
+) -> pd.DataFrame:
+    """Balance of covariates across the levels of `condition_col`.
+
+    Conditions are factorized once; numeric covariates are compared with
+    Kruskal-Wallis tests and categorical ones with chi-square tests of
+    independence, each family computed for all covariates together. Returns
+    one row per numeric covariate and per category level with the
+    per-condition n, mean and sd (for levels: count, proportion and
+    sqrt(p(1 - p))), the pairwise standardized mean differences, their
+    largest absolute value and the test of the covariate with its p-value
+    adjusted across all tested covariates (`correction` is a
+    `statsmodels.stats.multitest.multipletests` method, None to skip).
+    """
+    codes, conditions = pd.factorize(df[condition_col], sort=True)
+    if len(conditions) < 2:
+        raise ValueError(f"{condition_col!r} needs at least two levels to compare")
+    df = df[codes >= 0]
+    codes = codes[codes >= 0]
+    indicators = np.eye(len(conditions))[codes]
+    pairs = list(combinations(range(len(conditions)), 2))
+
+    blocks, summaries = [], []
+    if len(numeric_cols):
+        values = df[list(numeric_cols)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        observed = ~np.isnan(values)
+        filled = np.nan_to_num(values)
+
+        n = indicators.T @ observed
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (indicators.T @ filled) / n
+            variances = (indicators.T @ np.where(observed, values - means[codes], 0) ** 2) / (n - 1)
+        statistic, dof, p_value = _kruskal_wallis(values, indicators)
+
+        blocks.append(pd.DataFrame({
+            "variable": list(numeric_cols),
+            "level": None,
+            "test": "kruskal",
+            "statistic": statistic,
+            "dof": dof,
+            "p_value": p_value,
+        }))
+        summaries.append((n.T, means.T, np.sqrt(variances).T, _pairwise_smd(means.T, variances.T, pairs)))
+
+    if len(categorical_cols):
+        variables, levels, level_indicators = [], [], []
+        for column in categorical_cols:
+            level_codes, column_levels = pd.factorize(df[column], sort=True)
+            variables += [column] * len(column_levels)
+            levels += list(column_levels)
+            level_indicators.append(np.eye(len(column_levels) + 1)[level_codes, :-1])
+
+        blocks_of_levels = np.repeat(np.arange(len(categorical_cols)), [m.shape[1] for m in level_indicators])
+        counts = np.hstack(level_indicators).T @ indicators
+        statistic, dof, p_value = _chi2_independence(counts, blocks_of_levels)
+
+        totals = np.add.reduceat(counts, np.flatnonzero(np.r_[True, np.diff(blocks_of_levels) != 0]), axis=0)[blocks_of_levels]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            proportions = counts / totals
+        variances = proportions * (1 - proportions)
+
+        blocks.append(pd.DataFrame({
+            "variable": variables,
+            "level": levels,
+            "test": "chi2",
+            "statistic": statistic[blocks_of_levels],
+            "dof": dof[blocks_of_levels],
+            "p_value": p_value[blocks_of_levels],
+        }))
+        summaries.append((counts, proportions, np.sqrt(variances), _pairwise_smd(proportions, variances, pairs)))
+
+    if not blocks:
+        raise ValueError("Pass at least one numeric or categorical covariate")
+    table = pd.concat(blocks, ignore_index=True)
+
+    # one test per covariate, whatever the number of its levels
+    first = ~table["variable"].duplicated()
+    table["p_adjusted"] = table["p_value"]
+    if correction is not None:
+        adjusted = pd.Series(multipletests(table.loc[first, "p_value"], method=correction)[1], index=table.loc[first, "variable"])
+        table["p_adjusted"] = table["variable"].map(adjusted)
+
+    n, means, sds, smd = (np.vstack(parts) for parts in zip(*summaries))
+    for k, condition in enumerate(conditions):
+        table[f"n_{condition}"] = n[:, k].astype(int)
+        table[f"mean_{condition}"] = means[:, k]
+        table[f"sd_{condition}"] = sds[:, k]
+    for j, (a, b) in enumerate(pairs):
+        table[f"smd_{conditions[b]}_{conditions[a]}"] = smd[:, j]
+    table["max_abs_smd"] = np.fmax.reduce(np.abs(smd), axis=1)
+
+    return table
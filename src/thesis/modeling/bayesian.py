@@ -0,0 +1,133 @@
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import arviz as az
+import bambi as bmb
+import pandas as pd
+
+from config import CACHE_DIR
+
+from .design_cache import _referenced_columns, frame_fingerprint
+
+TRACE_DIR = CACHE_DIR / "bayesian"
+
+
+@dataclass(frozen=True)
+class BayesianSpec:
+    """A bambi model: `subset` is a `DataFrame.query` expression selecting
+    the estimation rows."""
+    formula: str
+    family: str = "bernoulli"
+    subset: str | None = None
+    name: str | None = None
+
+
+@dataclass(frozen=True)
+class SamplerSettings:
+    draws: int = 1000
+    tune: int = 1000
+    chains: int = 4
+    target_accept: float = 0.9
+    random_seed: int = 0
+
+
+# hierarchical logits with participant and case random intercepts
+CHAPTER_BAYESIAN_SPECS = [
+    BayesianSpec(
+        "switched ~ C(condition) + (1|participant_code) + (1|case_id)",
+        subset="initial_top_1_agree == 0",
+        name="switched",
+    ),
+    BayesianSpec(
+        "final_correct ~ C(condition) + (1|participant_code) + (1|case_id)",
+        name="final_correct",
+    ),
+    BayesianSpec(
+        "appropriate_reliance ~ C(condition) + (1|participant_code) + (1|case_id)",
+        subset="initial_agree_ai == 0",
+        name="appropriate_reliance",
+    ),
+]
+
+
+def _grouping_columns(formula: str) -> list[str]:
+    return re.findall(r"\|\s*([A-Za-z_][A-Za-z0-9_]*)\s*\)", formula)
+
+
+def trace_key(data: pd.DataFrame, spec: BayesianSpec, sampler: SamplerSettings) -> str:
+    """Hash of the spec, the referenced data columns, the sampler settings
+    and the bambi version."""
+    columns = _referenced_columns(data, f"{spec.formula} {spec.subset or ''}")
+    digest = hashlib.sha256()
+    digest.update(repr(spec).encode())
+    digest.update(frame_fingerprint(data, columns).encode())
+    digest.update(repr(sampler).encode())
+    digest.update(bmb.__version__.encode())
+    return digest.hexdigest()[:16]
+
+
+def trace_path(data: pd.DataFrame, spec: BayesianSpec, sampler: SamplerSettings) -> Path:
+    name = spec.name or "model"
+    return TRACE_DIR / f"{name}-{trace_key(data, spec, sampler)}.nc"
+
+
+def fit_bayesian(
+    data: pd.DataFrame,
+    spec: BayesianSpec,
+    sampler: SamplerSettings = SamplerSettings(),
+    cores: int | None = None,
+    use_cache: bool = True,
+) -> az.InferenceData:
+    """Posterior of `spec`, sampled with chains in parallel across `cores`
+    (default: one per chain, up to the CPU count).
+
+    Traces are stored as NetCDF under TRACE_DIR, keyed by spec, data
+    fingerprint and sampler settings, and are reloaded instead of resampled
+    when nothing changed.
+    """
+    path = trace_path(data, spec, sampler)
+    if use_cache and path.exists():
+        # read into memory so the file is closed and a later refit can replace it
+        with az.rc_context({"data.load": "eager"}):
+            return az.from_netcdf(path)
+
+    analysis_df = data if spec.subset is None else data.query(spec.subset)
+    # group-specific terms need categorical grouping factors (case_id is numeric)
+    analysis_df = analysis_df.astype({column: "category" for column in _grouping_columns(spec.formula)})
+
+    model = bmb.Model(spec.formula, analysis_df, family=spec.family)
+    idata = model.fit(
+        draws=sampler.draws,
+        tune=sampler.tune,
+        chains=sampler.chains,
+        cores=cores or min(sampler.chains, os.cpu_count()),
+        target_accept=sampler.target_accept,
+        random_seed=sampler.random_seed,
+    )
+
+    if use_cache:
+        # traces of earlier data or settings for the same model are replaced
+        for stale in TRACE_DIR.glob(f"{spec.name or 'model'}-" + "?" * 16 + ".nc"):
+            stale.unlink()
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".nc.tmp")
+        idata.to_netcdf(tmp_path)
+        tmp_path.replace(path)
+
+    return idata
+
+
+def fit_bayesian_models(
+    data: pd.DataFrame,
+    specs: list[BayesianSpec],
+    sampler: SamplerSettings = SamplerSettings(),
+    cores: int | None = None,
+) -> dict[str, az.InferenceData]:
+    """Posteriors of several specs by name; each fit runs its chains in parallel."""
+    return {
+        spec.name or spec.formula: fit_bayesian(data, spec, sampler, cores)
+        for spec in specs
+    }
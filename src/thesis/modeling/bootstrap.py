@@ -0,0 +1,147 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+CI_METHODS = {"percentile", "bca"}
+
+# per-worker state for the chunked replicates, set by the pool initializer
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(sums: np.ndarray, counts: np.ndarray, strata: np.ndarray) -> None:
+    _WORKER_STATE.update(sums=sums, counts=counts, strata=strata)
+
+
+def _resampling_weights(rng: np.random.Generator, strata: np.ndarray, n_replicates: int) -> np.ndarray:
+    """How often each cluster is drawn in each replicate, (replicates x
+    clusters); clusters are resampled with replacement within their stratum."""
+    weights = np.zeros((n_replicates, len(strata)))
+    for stratum in np.unique(strata):
+        members = np.flatnonzero(strata == stratum)
+        weights[:, members] = rng.multinomial(len(members), np.full(len(members), 1 / len(members)), size=n_replicates)
+    return weights
+
+
+def _replicate_rates(sums, counts, strata, seed: np.random.SeedSequence, n_replicates: int) -> np.ndarray:
+    weights = _resampling_weights(np.random.default_rng(seed), strata, n_replicates)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (weights @ sums) / (weights @ counts)
+
+
+def _replicate_chunk(task: tuple[np.random.SeedSequence, int]) -> np.ndarray:
+    return _replicate_rates(_WORKER_STATE["sums"], _WORKER_STATE["counts"], _WORKER_STATE["strata"], *task)
+
+
+def _jackknife_acceleration(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """BCa acceleration per cell from the leave-one-cluster-out rates,
+    over the clusters that contribute to the cell."""
+    total_sums, total_counts = sums.sum(axis=0), counts.sum(axis=0)
+    contributes = counts > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        jackknife = (total_sums - sums) / (total_counts - counts)
+
+    # like the replicates, undefined leave-one-out rates are left out
+    jackknife = np.where(contributes & np.isfinite(jackknife), jackknife, np.nan)
+    deviation = np.nanmean(jackknife, axis=0) - jackknife
+    with np.errstate(invalid="ignore", divide="ignore"):
+        acceleration = np.nansum(deviation ** 3, axis=0) / (6 * np.nansum(deviation ** 2, axis=0) ** 1.5)
+
+    return np.nan_to_num(acceleration)
+
+
+def _bca_levels(replicates: np.ndarray, estimate: np.ndarray, acceleration: np.ndarray, alpha: float) -> np.ndarray:
+    valid = ~np.isnan(replicates)
+    # replicates equal to the estimate count as half below; bootstrapped
+    # rates are discrete and often tie with it
+    below = np.where(valid, (replicates < estimate) + 0.5 * (replicates == estimate), 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        below = below.sum(axis=0) / valid.sum(axis=0)
+    bias = stats.norm.ppf(np.clip(below, 1e-12, 1 - 1e-12))
+
+    z = stats.norm.ppf([alpha / 2, 1 - alpha / 2])[:, None]
+    return stats.norm.cdf(bias + (bias + z) / (1 - acceleration * (bias + z)))
+
+
+def cluster_bootstrap_rates(
+    df: pd.DataFrame,
+    value_col: str,
+    group_cols: list[str],
+    cluster_col: str = "participant_code",
+    strata_col: str | None = None,
+    n_boot: int = 2000,
+    ci: str = "percentile",
+    alpha: float = 0.05,
+    seed: int = 0,
+    chunk_size: int = 500,
+    max_workers: int | None = 1,
+) -> pd.DataFrame:
+    """Rate of `value_col` per `group_cols` cell with cluster bootstrap intervals.
+
+    Clusters (participants) are resampled with replacement, within
+    `strata_col` if given (e.g. the between-subject condition). Values are
+    summed per cluster and cell once; each chunk of replicates is then one
+    multinomial weight matrix and one matrix product. Chunks have their own
+    seeds spawned from `seed`, so results do not depend on `max_workers`.
+    """
+    if ci not in CI_METHODS:
+        raise ValueError(f"Unknown interval {ci!r}, expected one of {sorted(CI_METHODS)}")
+
+    values = pd.to_numeric(df[value_col], errors="coerce")
+    columns = dict.fromkeys([*group_cols, cluster_col, *([strata_col] if strata_col else [])])
+    df = df.loc[values.notna(), list(columns)]
+    values = values[values.notna()].to_numpy(dtype=float)
+
+    grouped = df.groupby(group_cols, sort=True)
+    cells = grouped.ngroup()
+    keys = grouped.size().index.to_frame(index=False)
+
+    # rows with a missing group key are in no cell (ngroup is NaN for them)
+    in_cell = cells.notna().to_numpy()
+    df, values = df[in_cell], values[in_cell]
+    cells = cells[in_cell].to_numpy(dtype=int)
+
+    clusters, cluster_index = pd.factorize(df[cluster_col], sort=True)
+    n_clusters, n_cells = len(cluster_index), len(keys)
+
+    flat = clusters * n_cells + cells
+    sums = np.bincount(flat, weights=values, minlength=n_clusters * n_cells).reshape(n_clusters, n_cells)
+    counts = np.bincount(flat, minlength=n_clusters * n_cells).reshape(n_clusters, n_cells).astype(float)
+
+    if strata_col is None:
+        strata = np.zeros(n_clusters, dtype=int)
+    else:
+        strata = pd.factorize(df.groupby(clusters)[strata_col].first())[0]
+
+    chunks = [min(chunk_size, n_boot - start) for start in range(0, n_boot, chunk_size)]
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(chunks)), chunks))
+
+    if max_workers == 1:
+        replicates = np.vstack([_replicate_rates(sums, counts, strata, *task) for task in tasks])
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(sums, counts, strata),
+        ) as executor:
+            replicates = np.vstack(list(executor.map(_replicate_chunk, tasks)))
+
+    estimate = sums.sum(axis=0) / counts.sum(axis=0)
+    if ci == "percentile":
+        levels = np.repeat([[alpha / 2], [1 - alpha / 2]], n_cells, axis=1)
+    else:
+        levels = _bca_levels(replicates, estimate, _jackknife_acceleration(sums, counts), alpha)
+
+    bounds = np.array([
+        [np.nanquantile(replicates[:, cell], level) for cell, level in enumerate(bound_levels)]
+        for bound_levels in levels
+    ])
+
+    return keys.assign(
+        rate=estimate,
+        n=counts.sum(axis=0).astype(int),
+        se=np.nanstd(replicates, axis=0, ddof=1),
+        ci_lower=bounds[0],
+        ci_upper=bounds[1],
+    )
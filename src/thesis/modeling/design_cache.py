@@ -0,0 +1,203 @@
+import hashlib
+import itertools
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import patsy
+
+
+@dataclass
+class CachedDesign:
+    """Right-hand side built once on the full data.
+
+    `columns` lists, per design column, the (factor, level code, reduced
+    rank) of every categorical factor in it; `codes` holds each categorical
+    factor's level codes per data row (-1 where missing; None for fixed
+    levels). Both are None when the coding cannot be sliced (non-treatment
+    contrasts).
+    """
+    matrix: pd.DataFrame
+    rows: np.ndarray
+    columns: list[list[tuple[str, int, bool]]] | None
+    codes: dict[str, np.ndarray] | None
+
+
+DESIGN_CACHE: dict[tuple[str, str], CachedDesign] = {}
+
+
+def clear_design_cache() -> None:
+    DESIGN_CACHE.clear()
+
+
+def frame_fingerprint(data: pd.DataFrame, columns: list[str]) -> str:
+    """Hash of the index, dtypes and values of `columns` in `data`."""
+    hashes = pd.util.hash_pandas_object(data[columns], index=True).to_numpy()
+    digest = hashlib.sha256(hashes.tobytes())
+    digest.update(repr((columns, [str(dtype) for dtype in data[columns].dtypes])).encode())
+    return digest.hexdigest()[:16]
+
+
+def _referenced_columns(data: pd.DataFrame, rhs: str) -> list[str]:
+    tokens = set(re.findall(r"[A-Za-z_][A-Za-z0-9_]*", rhs))
+    return [column for column in data.columns if column in tokens]
+
+
+def _suffix_levels(categories: tuple, suffixes: list[str]) -> tuple[list[int], bool] | None:
+    if suffixes == [f"[T.{category}]" for category in categories[1:]]:
+        return list(range(1, len(categories))), True
+    if suffixes == [f"[{category}]" for category in categories]:
+        return list(range(len(categories))), False
+    return None
+
+
+def _column_levels(design_info) -> list[list[tuple[str, int, bool]]] | None:
+    columns = []
+    for term in design_info.terms:
+        for subterm in design_info.term_codings[term]:
+            per_factor = []
+            for factor in subterm.factors:
+                info = design_info.factor_infos[factor]
+                if info.type == "numerical":
+                    per_factor.append([None] * info.num_columns)
+                    continue
+                coding = _suffix_levels(info.categories, subterm.contrast_matrices[factor].column_suffixes)
+                if coding is None:
+                    return None
+                levels, reduced = coding
+                per_factor.append([(factor.name(), level, reduced) for level in levels])
+
+            # patsy enumerates subterm columns with the left-most factor varying fastest
+            for combination in itertools.product(*reversed(per_factor)):
+                columns.append([part for part in combination[::-1] if part is not None])
+
+    return columns
+
+
+def _as_categorical(values):
+    """Sorted-level pandas categorical, which patsy codes from its categories
+    instead of sniffing levels row by row."""
+    if isinstance(values, pd.Series) and not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.astype("category")
+    return values
+
+
+def C(data, contrast=None, levels=None):
+    """patsy's `C` with the data factorized once up front."""
+    return patsy.builtins.C(_as_categorical(data) if levels is None else data, contrast, levels)
+
+
+def _eval_env() -> patsy.EvalEnvironment:
+    return patsy.EvalEnvironment([{"C": C, "np": np}, vars(patsy.builtins)])
+
+
+def _factor_codes(data: pd.DataFrame, factor, categories: tuple) -> np.ndarray | None:
+    """Level codes of a categorical factor, or None when its levels are
+    fixed (explicit `levels` or a pandas categorical input) and so do not
+    depend on the rows present."""
+    env = patsy.EvalEnvironment([{"np": np}, vars(patsy.builtins)])
+    values = env.eval(factor.code, inner_namespace=data)
+    if getattr(values, "levels", None) is not None:
+        return None
+
+    values = getattr(values, "data", values)
+    if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+        return None
+
+    return pd.Categorical(np.asarray(values, dtype=object), categories=list(categories)).codes.astype(np.int64)
+
+
+def _build_design(data: pd.DataFrame, rhs: str) -> CachedDesign:
+    # positional index, so design rows map straight back to data rows
+    data = data.reset_index(drop=True)
+    referenced = _referenced_columns(data, rhs)
+    factorized = data[referenced].assign(**{
+        column: data[column].astype("category")
+        for column in referenced
+        if data[column].dtype == object or pd.api.types.is_string_dtype(data[column])
+    })
+
+    matrix = patsy.dmatrix(rhs, factorized, eval_env=_eval_env(), return_type="dataframe")
+    design_info = matrix.design_info
+
+    columns = _column_levels(design_info)
+    codes = None
+    if columns is not None:
+        codes = {
+            factor.name(): _factor_codes(data, factor, info.categories)
+            for factor, info in design_info.factor_infos.items()
+            if info.type == "categorical"
+        }
+
+    return CachedDesign(matrix, matrix.index.to_numpy(), columns, codes)
+
+
+def cached_design(data: pd.DataFrame, rhs: str) -> CachedDesign:
+    key = (rhs.strip(), frame_fingerprint(data, _referenced_columns(data, rhs)))
+    if key not in DESIGN_CACHE:
+        DESIGN_CACHE[key] = _build_design(data, rhs)
+    return DESIGN_CACHE[key]
+
+
+def _kept_columns(design: CachedDesign, in_subset: np.ndarray) -> np.ndarray:
+    """Columns patsy would build on the subset alone: levels absent from the
+    subset are dropped, and a reduced-rank factor whose reference level is
+    absent takes its first present level as the new reference."""
+    present = {}
+    for factor, codes in design.codes.items():
+        if codes is None:
+            continue
+        subset_codes = codes[in_subset]
+        levels_present = np.zeros(codes.max() + 1, dtype=bool)
+        levels_present[subset_codes[subset_codes >= 0]] = True
+        present[factor] = levels_present
+
+    keep = np.ones(len(design.columns), dtype=bool)
+    for i, parts in enumerate(design.columns):
+        for factor, level, reduced in parts:
+            if factor not in present:
+                continue
+            levels_present = present[factor]
+            new_reference = reduced and not levels_present[0] and level == levels_present.argmax()
+            if not levels_present[level] or new_reference:
+                keep[i] = False
+
+    return keep
+
+
+def model_matrices(
+    data: pd.DataFrame,
+    formula: str,
+    subset: str | None = None,
+) -> tuple[pd.Series, pd.DataFrame]:
+    """Outcome and design matrix for `formula` on the rows selected by the
+    `DataFrame.query` expression `subset`.
+
+    The right-hand side is built once per (formula RHS, data fingerprint)
+    and reused across outcomes and row subsets; subsets are sliced from the
+    cached matrix instead of being rebuilt. Rows with a missing outcome or
+    covariate are dropped as in a formula fit.
+    """
+    lhs, rhs = formula.split("~", 1)
+    lhs = lhs.strip()
+    if lhs not in data.columns:
+        raise ValueError(f"The outcome {lhs!r} must be a column of the data")
+
+    in_subset = np.ones(len(data), dtype=bool) if subset is None else data.eval(subset).to_numpy(dtype=bool)
+    design = cached_design(data, rhs)
+
+    if design.columns is None:
+        analysis_df = data[in_subset]
+        y, X = patsy.dmatrices(formula, analysis_df, eval_env=_eval_env(), return_type="dataframe")
+        return y[lhs], X
+
+    outcome = data[lhs].to_numpy(dtype=float, na_value=np.nan)
+    row_mask = in_subset[design.rows] & ~np.isnan(outcome[design.rows])
+    rows = design.rows[row_mask]
+
+    X = design.matrix.iloc[row_mask, _kept_columns(design, in_subset)]
+    X.index = data.index[rows]
+    y = pd.Series(outcome[rows], index=X.index, name=lhs)
+
+    return y, X
@@ -0,0 +1,290 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+
+@dataclass
+class ClusteredFit:
+    """Coefficients and (cluster-robust) covariance of a logit or OLS fit."""
+    params: pd.Series
+    cov: pd.DataFrame
+    nobs: int
+    n_groups: int | None
+    llf: float | None
+    converged: bool
+    n_iter: int
+
+    @property
+    def bse(self) -> pd.Series:
+        return pd.Series(np.sqrt(np.diag(self.cov)), index=self.params.index)
+
+    @property
+    def zvalues(self) -> pd.Series:
+        return self.params / self.bse
+
+    @property
+    def pvalues(self) -> pd.Series:
+        return pd.Series(2 * stats.norm.sf(np.abs(self.zvalues)), index=self.params.index)
+
+    def conf_int(self, alpha: float = 0.05) -> pd.DataFrame:
+        q = stats.norm.ppf(1 - alpha / 2)
+        return pd.DataFrame({0: self.params - q * self.bse, 1: self.params + q * self.bse})
+
+
+def _as_arrays(y, X, weights) -> tuple[np.ndarray, np.ndarray, np.ndarray, pd.Index]:
+    columns = X.columns if isinstance(X, pd.DataFrame) else pd.RangeIndex(np.shape(X)[1])
+    y = np.asarray(y, dtype=float)
+    X = np.asarray(X, dtype=float)
+    weights = np.ones(len(y)) if weights is None else np.asarray(weights, dtype=float)
+
+    if X.ndim != 2 or len(X) != len(y) or len(weights) != len(y):
+        raise ValueError("y, X and weights must have matching rows")
+
+    return y, X, weights, columns
+
+
+def group_sums(values: np.ndarray, groups) -> np.ndarray:
+    """Column sums of `values` per group, one row per group in sorted group order."""
+    codes, _ = pd.factorize(np.asarray(groups), sort=True)
+    if (codes < 0).any():
+        raise ValueError("groups must not contain missing values")
+
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]])
+    return np.add.reduceat(values[order], starts, axis=0)
+
+
+def cluster_covariance(scores: np.ndarray, bread: np.ndarray, groups) -> tuple[np.ndarray, int]:
+    """CRV1 sandwich `bread @ meat @ bread` with the meat built from the
+    per-cluster score sums, scaled by G/(G-1) * (N-1)/(N-K) like Stata and
+    statsmodels."""
+    nobs, k = scores.shape
+    cluster_scores = group_sums(scores, groups)
+    n_groups = len(cluster_scores)
+    if n_groups < 2:
+        raise ValueError("Cluster-robust errors need at least two clusters")
+
+    meat = cluster_scores.T @ cluster_scores
+    correction = n_groups / (n_groups - 1) * (nobs - 1) / (nobs - k)
+
+    return correction * bread @ meat @ bread, n_groups
+
+
+def _start_params(start, columns: pd.Index) -> np.ndarray:
+    if start is None:
+        return np.zeros(len(columns))
+    if isinstance(start, pd.Series):
+        # warm start from a nested model: shared coefficients by name, zeros elsewhere
+        return start.reindex(columns, fill_value=0.0).to_numpy(dtype=float)
+    start = np.asarray(start, dtype=float)
+    if start.shape != (len(columns),):
+        raise ValueError(f"start needs {len(columns)} values, got {start.shape}")
+    return start
+
+
+def _finish(params, cov, columns, nobs, n_groups, llf, converged, n_iter) -> ClusteredFit:
+    return ClusteredFit(
+        params=pd.Series(params, index=columns),
+        cov=pd.DataFrame(cov, index=columns, columns=columns),
+        nobs=nobs,
+        n_groups=n_groups,
+        llf=llf,
+        converged=converged,
+        n_iter=n_iter,
+    )
+
+
+def fit_ols(y, X, groups=None, weights=None) -> ClusteredFit:
+    """(Weighted) least squares in closed form.
+
+    With `groups` the covariance is the participant-clustered sandwich,
+    otherwise the classical OLS covariance.
+    """
+    y, X, weights, columns = _as_arrays(y, X, weights)
+    nobs, k = X.shape
+
+    wX = X * weights[:, None]
+    bread = np.linalg.inv(X.T @ wX)
+    params = bread @ (wX.T @ y)
+    resid = y - X @ params
+
+    if groups is None:
+        sigma2 = (weights * resid ** 2).sum() / (nobs - k)
+        return _finish(params, sigma2 * bread, columns, nobs, None, None, True, 0)
+
+    cov, n_groups = cluster_covariance(wX * resid[:, None], bread, groups)
+    return _finish(params, cov, columns, nobs, n_groups, None, True, 0)
+
+
+def _logit_llf(y, eta, weights) -> float:
+    # y log p + (1 - y) log(1 - p) = y eta - log(1 + exp(eta))
+    return (weights * (y * eta - np.logaddexp(0, eta))).sum(axis=-1)
+
+
+def fit_logit(
+    y,
+    X,
+    groups=None,
+    weights=None,
+    start=None,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> ClusteredFit:
+    """Logistic regression by Newton-Raphson (IRLS).
+
+    `start` warm-starts the iterations; a Series is aligned to the columns
+    of `X` by name, so the fit of a nested model (e.g. condition only) can
+    seed the larger one (condition + case). Steps are halved whenever the
+    log-likelihood would decrease; if 30 halvings do not help, the fit stops
+    at the last accepted estimates and is reported as not converged. With
+    `groups` the covariance is the cluster sandwich, otherwise the inverse
+    information matrix.
+    """
+    y, X, weights, columns = _as_arrays(y, X, weights)
+    nobs = len(y)
+
+    params = _start_params(start, columns)
+    eta = X @ params
+    llf = _logit_llf(y, eta, weights)
+
+    converged = False
+    n_iter = 0
+    while n_iter < max_iter:
+        n_iter += 1
+        p = special.expit(eta)
+        gradient = X.T @ (weights * (y - p))
+        hessian = (X * (weights * p * (1 - p))[:, None]).T @ X
+        step = np.linalg.solve(hessian, gradient)
+
+        for _ in range(30):
+            new_eta = X @ (params + step)
+            new_llf = _logit_llf(y, new_eta, weights)
+            if new_llf >= llf - 1e-12 * abs(llf):
+                break
+            step /= 2
+        else:
+            # line search exhausted: keep the last accepted params and eta
+            break
+
+        params, eta, llf = params + step, new_eta, new_llf
+        if np.max(np.abs(step)) < tol:
+            converged = True
+            break
+
+    p = special.expit(eta)
+    bread = np.linalg.inv((X * (weights * p * (1 - p))[:, None]).T @ X)
+
+    if groups is None:
+        return _finish(params, bread, columns, nobs, None, llf, converged, n_iter)
+
+    scores = X * (weights * (y - p))[:, None]
+    cov, n_groups = cluster_covariance(scores, bread, groups)
+    return _finish(params, cov, columns, nobs, n_groups, llf, converged, n_iter)
+
+
+def _batch_cluster_covariance(scores: np.ndarray, bread: np.ndarray, groups) -> np.ndarray:
+    """`cluster_covariance` for a stack of fits, scores (fits x rows x k)."""
+    _, nobs, k = scores.shape
+    codes, _ = pd.factorize(np.asarray(groups), sort=True)
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]])
+    cluster_scores = np.add.reduceat(scores[:, order], starts, axis=1)
+
+    n_groups = len(starts)
+    meat = cluster_scores.transpose(0, 2, 1) @ cluster_scores
+    correction = n_groups / (n_groups - 1) * (nobs - 1) / (nobs - k)
+
+    return correction * bread @ meat @ bread
+
+
+def _weighted_gram(X: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """X' diag(w) X for every row of `weights` (fits x rows), as one batched matmul."""
+    return (weights[..., None] * X).transpose(0, 2, 1) @ X
+
+
+def fit_ols_batch(Y: np.ndarray, X: np.ndarray, groups) -> tuple[np.ndarray, np.ndarray]:
+    """OLS of every row of `Y` (fits x rows) on the shared design `X`.
+
+    Returns (params, standard errors), each (fits x k), with cluster-robust
+    errors as in `fit_ols`.
+    """
+    X = np.asarray(X, dtype=float)
+    bread = np.linalg.inv(X.T @ X)
+    params = Y @ (X @ bread)
+    resid = Y - params @ X.T
+
+    cov = _batch_cluster_covariance(X[None] * resid[..., None], bread[None], groups)
+    return params, np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+
+
+def fit_logit_batch(
+    Y: np.ndarray,
+    X: np.ndarray,
+    groups,
+    tol: float = 1e-8,
+    max_iter: int = 50,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Logits of every row of `Y` (fits x rows) on the shared design `X`,
+    with all fits advanced together by batched Newton steps.
+
+    Returns (params, standard errors, converged). Steps are halved per fit
+    as in `fit_logit`; fits whose line search is exhausted stop there. Fits
+    that do not converge (e.g. under separation) get NaN estimates.
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    n_fits, k = len(Y), X.shape[1]
+
+    params = np.zeros((n_fits, k))
+    # linear predictor and log-likelihood of the accepted estimates
+    eta = np.zeros((n_fits, len(X)))
+    llf = _logit_llf(Y, eta, 1.0)
+    converged = np.zeros(n_fits, dtype=bool)
+    active = np.ones(n_fits, dtype=bool)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        for _ in range(max_iter):
+            fits = np.flatnonzero(active)
+            p = special.expit(eta[fits])
+            gradient = (Y[fits] - p) @ X
+            hessian = _weighted_gram(X, p * (1 - p))
+            try:
+                step = np.linalg.solve(hessian, gradient[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                step = np.stack([np.linalg.lstsq(h, g, rcond=None)[0] for h, g in zip(hessian, gradient)])
+
+            # halve the steps of the fits whose log-likelihood would decrease;
+            # those still failing after 30 halvings keep their last accepted
+            # estimates and stop unconverged
+            new_eta = eta[fits] + step @ X.T
+            new_llf = _logit_llf(Y[fits], new_eta, 1.0)
+            for _ in range(30):
+                worse = new_llf < llf[fits] - 1e-12 * np.abs(llf[fits])
+                if not worse.any():
+                    break
+                step[worse] /= 2
+                new_eta[worse] = eta[fits[worse]] + step[worse] @ X.T
+                new_llf[worse] = _logit_llf(Y[fits[worse]], new_eta[worse], 1.0)
+            step[worse] = 0
+
+            accepted = fits[~worse]
+            params[fits] += step
+            eta[accepted], llf[accepted] = new_eta[~worse], new_llf[~worse]
+
+            done = (np.max(np.abs(step), axis=1) < tol) & ~worse
+            converged[fits[done]] = True
+            active[fits[done | worse | ~np.isfinite(step).all(axis=1)]] = False
+            if not active.any():
+                break
+
+        params[~converged] = np.nan
+        p = special.expit(params @ X.T)
+        hessian = _weighted_gram(X, p * (1 - p))
+        bread = np.full_like(hessian, np.nan)
+        bread[converged] = np.linalg.inv(hessian[converged])
+
+        cov = _batch_cluster_covariance(X[None] * (Y - p)[..., None], bread, groups)
+
+    return params, np.sqrt(np.diagonal(cov, axis1=1, axis2=2)), converged
@@ -0,0 +1,105 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+import statsmodels.api as sm
+
+from .design_cache import model_matrices
+
+ESTIMATORS = {
+    "logit": sm.Logit,
+    "ols": sm.OLS,
+}
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """One model fit: `subset` is a `DataFrame.query` expression selecting
+    the estimation rows, `cluster` the column for cluster-robust errors
+    (None for non-robust errors)."""
+    formula: str
+    estimator: str = "logit"
+    subset: str | None = None
+    cluster: str | None = "participant_code"
+    name: str | None = None
+
+
+@dataclass
+class ModelResult:
+    spec: ModelSpec
+    nobs: int
+    coefficients: pd.DataFrame
+    summary: str
+    converged: bool
+
+
+# the trial table is sent to each worker once through the pool initializer
+# instead of being pickled with every task
+_WORKER_DATA: pd.DataFrame | None = None
+
+
+def _init_worker(data: pd.DataFrame) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def fit_model(data: pd.DataFrame, spec: ModelSpec):
+    if spec.estimator not in ESTIMATORS:
+        raise ValueError(f"Unknown estimator {spec.estimator!r}, expected one of {sorted(ESTIMATORS)}")
+
+    y, X = model_matrices(data, spec.formula, spec.subset)
+    model = ESTIMATORS[spec.estimator](y, X)
+
+    fit_kwargs = {}
+    if spec.cluster is not None:
+        fit_kwargs = {"cov_type": "cluster", "cov_kwds": {"groups": data.loc[y.index, spec.cluster]}}
+    if spec.estimator == "logit":
+        fit_kwargs["disp"] = False
+
+    return model.fit(**fit_kwargs)
+
+
+def _summarize(result, spec: ModelSpec) -> ModelResult:
+    conf_int = result.conf_int()
+    coefficients = pd.DataFrame({
+        "coef": result.params,
+        "std_err": result.bse,
+        "stat": result.tvalues,
+        "p_value": result.pvalues,
+        "ci_lower": conf_int[0],
+        "ci_upper": conf_int[1],
+    })
+
+    return ModelResult(
+        spec=spec,
+        nobs=int(result.nobs),
+        coefficients=coefficients,
+        summary=str(result.summary()),
+        # OLS has no iterative fit and so no mle_retvals
+        converged=bool(getattr(result, "mle_retvals", {}).get("converged", True)),
+    )
+
+
+def _run_spec(spec: ModelSpec) -> ModelResult:
+    return _summarize(fit_model(_WORKER_DATA, spec), spec)
+
+
+def run_model_batch(
+    data: pd.DataFrame,
+    specs: list[ModelSpec],
+    max_workers: int | None = None,
+) -> list[ModelResult]:
+    """Fit every spec on `data` and return the results in spec order.
+
+    With `max_workers=1` the fits run serially in-process; otherwise they
+    are scheduled across a process pool.
+    """
+    if max_workers == 1:
+        return [_summarize(fit_model(data, spec), spec) for spec in specs]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(data,),
+    ) as executor:
+        return list(executor.map(_run_spec, specs))
@@ -0,0 +1,158 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+LEVELS = {"trial", "participant"}
+
+
+def _range(rates: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return np.nanmax(rates, axis=-2) - np.nanmin(rates, axis=-2)
+
+
+def _between_variance(rates: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    overall = (rates * counts).sum(axis=-2, keepdims=True) / counts.sum(axis=-2, keepdims=True)
+    return (counts * (rates - overall) ** 2).sum(axis=-2) / counts.sum(axis=-2)
+
+
+# omnibus statistics over the per-condition rates (condition axis -2);
+# large values are evidence against the null
+OMNIBUS_STATISTICS = {
+    "range": _range,
+    "between_variance": _between_variance,
+}
+
+# per-worker state for the chunked permutations, set by the pool initializer
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(sums: np.ndarray, counts: np.ndarray, labels: np.ndarray, n_conditions: int) -> None:
+    _WORKER_STATE.update(sums=sums, counts=counts, labels=labels, n_conditions=n_conditions)
+
+
+def _condition_rates(sums, counts, labels, n_conditions) -> tuple[np.ndarray, np.ndarray]:
+    """Per-condition rates for each row of `labels` (permutations x
+    participants): returns (permutations x conditions x variables) rates
+    and counts, one matrix product per condition."""
+    condition_sums = np.stack([(labels == k).astype(float) @ sums for k in range(n_conditions)], axis=-2)
+    condition_counts = np.stack([(labels == k).astype(float) @ counts for k in range(n_conditions)], axis=-2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return condition_sums / condition_counts, condition_counts
+
+
+def _statistics(rates, counts, pairs, statistics) -> np.ndarray:
+    """(permutations x statistics x variables): pairwise differences first,
+    then the omnibus statistics."""
+    differences = [rates[..., b, :] - rates[..., a, :] for a, b in pairs]
+    omnibus = [OMNIBUS_STATISTICS[name](rates, counts) for name in statistics]
+    return np.stack(differences + omnibus, axis=-2)
+
+
+def _permuted_statistics(sums, counts, labels, n_conditions, pairs, statistics, seed, n_permutations) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    permuted = rng.permuted(np.tile(labels, (n_permutations, 1)), axis=1)
+    rates, condition_counts = _condition_rates(sums, counts, permuted, n_conditions)
+    return _statistics(rates, condition_counts, pairs, statistics)
+
+
+def _permutation_chunk(task: tuple) -> np.ndarray:
+    state = _WORKER_STATE
+    return _permuted_statistics(state["sums"], state["counts"], state["labels"], state["n_conditions"], *task)
+
+
+def permutation_test(
+    df: pd.DataFrame,
+    value_cols: list[str],
+    condition_col: str = "condition",
+    cluster_col: str = "participant_code",
+    statistics: list[str] = ("range", "between_variance"),
+    level: str = "trial",
+    n_permutations: int = 10_000,
+    seed: int = 0,
+    chunk_size: int = 1000,
+    max_workers: int | None = 1,
+) -> pd.DataFrame:
+    """Randomization test of condition effects on the rates of `value_cols`.
+
+    Condition labels are permuted across participants, matching how they
+    were assigned. Each participant's sums and trial counts are computed
+    once; a permutation only regroups them, so all `value_cols`, every
+    pairwise difference and the omnibus `statistics` are evaluated together
+    by matrix products. With `level="participant"` conditions are compared
+    on participant means instead of pooled trial rates.
+
+    Returns one row per variable and statistic with the observed value and
+    the two-sided (differences) or upper-tail (omnibus) p-value.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown level {level!r}, expected one of {sorted(LEVELS)}")
+    unknown = set(statistics) - set(OMNIBUS_STATISTICS)
+    if unknown:
+        raise ValueError(f"Unknown statistics {sorted(unknown)}, expected one of {sorted(OMNIBUS_STATISTICS)}")
+
+    participants, participant_index = pd.factorize(df[cluster_col], sort=True)
+    values = df[value_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    observed_value = ~np.isnan(values)
+
+    n_participants = len(participant_index)
+    sums = np.stack([
+        np.bincount(participants, weights=np.where(observed_value[:, j], values[:, j], 0), minlength=n_participants)
+        for j in range(len(value_cols))
+    ], axis=1)
+    counts = np.stack([
+        np.bincount(participants, weights=observed_value[:, j], minlength=n_participants)
+        for j in range(len(value_cols))
+    ], axis=1)
+    if level == "participant":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sums, counts = sums / counts, (counts > 0).astype(float)
+        sums = np.nan_to_num(sums)
+
+    participant_conditions = df.groupby(participants)[condition_col].agg(["first", "nunique"])
+    if (participant_conditions["nunique"] > 1).any():
+        raise ValueError(f"{condition_col!r} must be constant within each {cluster_col!r}")
+    labels, conditions = pd.factorize(participant_conditions["first"], sort=True)
+    n_conditions = len(conditions)
+
+    pairs = list(combinations(range(n_conditions), 2))
+    names = [f"{conditions[b]} - {conditions[a]}" for a, b in pairs] + list(statistics)
+
+    rates, condition_counts = _condition_rates(sums, counts, labels[None, :], n_conditions)
+    observed = _statistics(rates, condition_counts, pairs, statistics)[0]
+
+    chunks = [min(chunk_size, n_permutations - start) for start in range(0, n_permutations, chunk_size)]
+    tasks = [
+        (pairs, list(statistics), chunk_seed, n)
+        for chunk_seed, n in zip(np.random.SeedSequence(seed).spawn(len(chunks)), chunks)
+    ]
+    if max_workers == 1:
+        permuted = np.concatenate([
+            _permuted_statistics(sums, counts, labels, n_conditions, *task) for task in tasks
+        ])
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(sums, counts, labels, n_conditions),
+        ) as executor:
+            permuted = np.concatenate(list(executor.map(_permutation_chunk, tasks)))
+
+    # differences are two-sided, omnibus statistics upper-tail; the observed
+    # assignment counts as one permutation
+    two_sided = np.array([True] * len(pairs) + [False] * len(statistics))[:, None]
+    tolerance = 1e-12
+    extreme = np.where(
+        two_sided,
+        np.abs(permuted) >= np.abs(observed) - tolerance,
+        permuted >= observed - tolerance,
+    )
+    p_values = (1 + extreme.sum(axis=0)) / (1 + n_permutations)
+
+    return pd.DataFrame({
+        "variable": np.tile(value_cols, len(names)),
+        "statistic": np.repeat(names, len(value_cols)),
+        "observed": observed.ravel(),
+        "p_value": p_values.ravel(),
+        "n_permutations": n_permutations,
+    })
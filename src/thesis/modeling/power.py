@@ -0,0 +1,187 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+from .design_cache import model_matrices
+from .estimators import fit_logit_batch, fit_ols_batch
+
+CONDITIONS = ["C1", "C2", "C3"]
+
+
+def simulate_design(n_per_condition: int, n_trials: int = 15) -> pd.DataFrame:
+    """Trial table with the structure of `main_trials_df`: participants
+    nested in conditions, each answering one trial per case."""
+    n_participants = n_per_condition * len(CONDITIONS)
+    participant = np.repeat(np.arange(n_participants), n_trials)
+
+    return pd.DataFrame({
+        "participant_code": pd.Series(participant).map("sim{:05d}".format),
+        "condition": np.repeat(CONDITIONS, n_per_condition * n_trials),
+        "trial_index": np.tile(np.arange(1, n_trials + 1), n_participants),
+        "case_id": np.tile(np.arange(n_trials), n_participants),
+    })
+
+
+def simulate_outcomes(
+    design: pd.DataFrame,
+    condition_effects: dict[str, float],
+    baseline_rate: float = 0.5,
+    icc: float = 0.1,
+    case_sd: float = 0.5,
+    n_replicates: int = 1,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Binary outcomes (replicates x trials) from a logistic model.
+
+    `condition_effects` are log-odds differences to C1 and `baseline_rate`
+    the C1 rate for an average participant and case. Participant intercepts
+    have the variance giving intra-participant correlation `icc` on the
+    latent logistic scale; case effects are normal with `case_sd`.
+    """
+    rng = rng or np.random.default_rng()
+    participants, participant_index = pd.factorize(design["participant_code"])
+    cases, case_index = pd.factorize(design["case_id"])
+
+    participant_sd = np.sqrt(icc / (1 - icc) * np.pi ** 2 / 3)
+    fixed = special.logit(baseline_rate) + design["condition"].map(condition_effects).fillna(0.0).to_numpy()
+
+    participant_effects = rng.normal(0, participant_sd, (n_replicates, len(participant_index)))
+    case_effects = rng.normal(0, case_sd, (n_replicates, len(case_index)))
+    eta = fixed + participant_effects[:, participants] + case_effects[:, cases]
+
+    return (rng.random(eta.shape) < special.expit(eta)).astype(np.int8)
+
+
+def simulate_trials(
+    n_per_condition: int,
+    condition_effects: dict[str, float],
+    outcome: str = "switched",
+    seed: int = 0,
+    **kwargs,
+) -> pd.DataFrame:
+    """One synthetic `main_trials_df`-like dataset with `outcome` simulated."""
+    design = simulate_design(n_per_condition)
+    y = simulate_outcomes(design, condition_effects, rng=np.random.default_rng(seed), **kwargs)[0]
+    return design.assign(**{outcome: y})
+
+
+# per-worker scenario designs, set by the pool initializer
+_WORKER_DESIGNS: list[dict] = []
+
+
+def _init_worker(designs: list[dict]) -> None:
+    _WORKER_DESIGNS[:] = designs
+
+
+def _replicate_chunk(designs: list[dict], task: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """Simulate and fit one chunk of replicates of a scenario; returns the
+    p-values of the tested coefficients and the convergence flags."""
+    scenario, seed, n_replicates = task
+    entry = designs[scenario]
+
+    Y = simulate_outcomes(entry["design"], n_replicates=n_replicates, rng=np.random.default_rng(seed), **entry["parameters"])
+    if entry["estimator"] == "ols":
+        params, bse = fit_ols_batch(Y, entry["X"], entry["groups"])
+        converged = np.ones(n_replicates, dtype=bool)
+    else:
+        params, bse, converged = fit_logit_batch(Y, entry["X"], entry["groups"])
+
+    columns = entry["columns"]
+    with np.errstate(invalid="ignore"):
+        p_values = 2 * stats.norm.sf(np.abs(params[:, columns] / bse[:, columns]))
+    return p_values, converged
+
+
+def _worker_chunk(task: tuple) -> tuple[np.ndarray, np.ndarray]:
+    return _replicate_chunk(_WORKER_DESIGNS, task)
+
+
+def power_analysis(
+    n_per_condition: list[int],
+    condition_effects: list[dict[str, float]],
+    icc: list[float] = (0.1,),
+    formula: str = "outcome ~ C(condition)",
+    estimator: str = "logit",
+    baseline_rate: float = 0.5,
+    case_sd: float = 0.5,
+    n_replicates: int = 1000,
+    alpha: float = 0.05,
+    seed: int = 0,
+    chunk_size: int = 250,
+    max_workers: int | None = 1,
+) -> pd.DataFrame:
+    """Simulated power of the participant-clustered Wald tests in `formula`
+    over the grid of participant counts, condition effects and ICCs.
+
+    The design of each scenario is fixed, so its design matrix is built once
+    and all replicates of a chunk are simulated and fitted together. Chunks
+    have their own seeds spawned from `seed` and run in a process pool.
+    Returns one row per scenario and condition coefficient with the
+    rejection rate, its Monte Carlo standard error and how many fits
+    converged (non-converged fits count as non-rejections).
+    """
+    if estimator not in ("logit", "ols"):
+        raise ValueError(f"Unknown estimator {estimator!r}, expected 'logit' or 'ols'")
+    if "~" not in formula:
+        raise ValueError(f"Formula {formula!r} has no '~'; expected e.g. 'outcome ~ C(condition)'")
+
+    scenarios = list(product(n_per_condition, range(len(condition_effects)), icc))
+    designs = []
+    for n, effects, scenario_icc in scenarios:
+        design = simulate_design(n).assign(outcome=0)
+        # the outcome is simulated, so any left-hand side (e.g. a chapter
+        # formula's final_correct) is replaced by the placeholder column
+        _, X = model_matrices(design, "outcome ~" + formula.split("~", 1)[1])
+        columns = [i for i, name in enumerate(X.columns) if name.startswith("C(condition)")]
+        designs.append({
+            "design": design,
+            "X": X.to_numpy(),
+            "groups": design["participant_code"].to_numpy(),
+            "columns": columns,
+            "terms": X.columns[columns],
+            "estimator": estimator,
+            "parameters": {
+                "condition_effects": condition_effects[effects],
+                "baseline_rate": baseline_rate,
+                "icc": scenario_icc,
+                "case_sd": case_sd,
+            },
+        })
+
+    chunks = [min(chunk_size, n_replicates - start) for start in range(0, n_replicates, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(scenarios) * len(chunks))
+    tasks = [
+        (scenario, seeds[scenario * len(chunks) + i], n)
+        for scenario in range(len(scenarios))
+        for i, n in enumerate(chunks)
+    ]
+
+    if max_workers == 1:
+        results = [_replicate_chunk(designs, task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(designs,)) as executor:
+            results = list(executor.map(_worker_chunk, tasks))
+
+    rows = []
+    for scenario, (n, effects, scenario_icc) in enumerate(scenarios):
+        scenario_results = results[scenario * len(chunks):(scenario + 1) * len(chunks)]
+        p_values = np.concatenate([p for p, _ in scenario_results])
+        converged = np.concatenate([c for _, c in scenario_results])
+        rejected = np.nan_to_num(p_values, nan=1.0) < alpha
+
+        for j, term in enumerate(designs[scenario]["terms"]):
+            power = rejected[:, j].mean()
+            rows.append({
+                "n_per_condition": n,
+                "condition_effects": condition_effects[effects],
+                "icc": scenario_icc,
+                "term": term,
+                "power": power,
+                "mcse": np.sqrt(power * (1 - power) / n_replicates),
+                "n_converged": int(converged.sum()),
+            })
+
+    return pd.DataFrame(rows)
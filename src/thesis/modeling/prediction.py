@@ -0,0 +1,104 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+import patsy
+import statsmodels.api as sm
+from scipy import special, stats
+
+# prediction grids per fitted model, dropped together with the model
+PREDICTION_CACHE: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def clear_prediction_cache() -> None:
+    PREDICTION_CACHE.clear()
+
+
+def _inverse_link(model) -> tuple:
+    """Inverse link of a fitted model and its derivative, both of the linear predictor."""
+    estimator = model.model
+    if isinstance(estimator, sm.Logit):
+        return special.expit, lambda eta: special.expit(eta) * special.expit(-eta)
+    if isinstance(estimator, sm.Probit):
+        return stats.norm.cdf, stats.norm.pdf
+    if isinstance(estimator, sm.GLM):
+        link = estimator.family.link
+        return link.inverse, link.inverse_deriv
+    if isinstance(estimator, sm.regression.linear_model.RegressionModel):
+        return (lambda eta: eta), np.ones_like
+    raise ValueError(f"No link known for {type(estimator).__name__} models")
+
+
+def _design_info(model) -> patsy.DesignInfo:
+    spec = getattr(model.model, "model_spec", None) or getattr(model.model.data, "model_spec", None)
+    if not isinstance(spec, patsy.DesignInfo):
+        raise ValueError("Predictions need a model fitted from a formula")
+    return spec
+
+
+def _grid_frame(model, grid: dict) -> pd.DataFrame:
+    """All combinations of the `grid` values, the first key varying slowest;
+    None stands for every value the column takes in the estimation data."""
+    values = [
+        np.sort(pd.unique(model.model.data.frame[column].dropna())) if levels is None else list(levels)
+        for column, levels in grid.items()
+    ]
+    return pd.MultiIndex.from_product(values, names=list(grid)).to_frame(index=False)
+
+
+def _sup_t_critical(X: np.ndarray, cov: np.ndarray, se: np.ndarray, alpha: float, n_draws: int, seed: int) -> float:
+    """Quantile of max |t| over the grid rows under the asymptotic normal
+    distribution of the estimates, from `n_draws` simulated parameter vectors."""
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    root = eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        loadings = np.where(se[:, None] > 0, (X @ root) / se[:, None], 0)
+    draws = np.random.default_rng(seed).standard_normal((n_draws, len(eigenvalues)))
+    return float(np.quantile(np.abs(draws @ loadings.T).max(axis=1), 1 - alpha))
+
+
+def prediction_grid(
+    model,
+    grid: dict,
+    alpha: float = 0.05,
+    n_draws: int = 10_000,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Predicted means of a fitted statsmodels formula model (OLS, logit,
+    probit or GLM) over the product of the `grid` values, e.g. a covariate
+    range by every condition (pass None for all observed levels).
+
+    The grid goes through the model's design once and is evaluated with its
+    covariance (cluster-robust if fitted so) in one pass. `ci_*` are the
+    pointwise and `band_*` the simultaneous (sup-t) intervals over the whole
+    grid; both are formed on the linear predictor and mapped through the
+    inverse link, so the pointwise ones equal `get_prediction`. `se` is the
+    delta-method standard error of the mean. Results are cached per model
+    and arguments; treat the returned frame as read-only.
+    """
+    key = (tuple((column, None if levels is None else tuple(levels)) for column, levels in grid.items()), alpha, n_draws, seed)
+    model_cache = PREDICTION_CACHE.setdefault(model, {})
+    if key in model_cache:
+        return model_cache[key]
+
+    inverse, derivative = _inverse_link(model)
+    frame = _grid_frame(model, grid)
+    X = np.asarray(patsy.build_design_matrices([_design_info(model)], frame)[0])
+    cov = np.asarray(model.cov_params())
+
+    eta = X @ np.asarray(model.params)
+    se = np.sqrt(((X @ cov) * X).sum(axis=1))
+    z = stats.norm.ppf(1 - alpha / 2)
+    critical = _sup_t_critical(X, cov, se, alpha, n_draws, seed)
+
+    result = frame.assign(
+        mean=inverse(eta),
+        se=derivative(eta) * se,
+        ci_lower=inverse(eta - z * se),
+        ci_upper=inverse(eta + z * se),
+        band_lower=inverse(eta - critical * se),
+        band_upper=inverse(eta + critical * se),
+    )
+    model_cache[key] = result
+    return result
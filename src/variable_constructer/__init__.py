@@ -1,7 +1,18 @@
+from .compact import compact_trial_table, memory_report
 from .construct_variables import (construct_trial_level_variables,
                                   create_participant_stats)
+from .participant_aggregation import PARTICIPANT_OUTCOME_METRICS, aggregate_participants
+from .registry import LazyTrials, compute_variables, derived_variable, resolve_dependencies
 
 __all__ = [
+    "LazyTrials",
+    "PARTICIPANT_OUTCOME_METRICS",
+    "aggregate_participants",
+    "compact_trial_table",
+    "compute_variables",
     "construct_trial_level_variables",
     "create_participant_stats",
+    "derived_variable",
+    "memory_report",
+    "resolve_dependencies",
 ]
\ No newline at end of file
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from .labels import CP_CONTAINS_COLUMNS, LABEL_COLUMNS, LABELS, NORMALIZED_COLUMNS
+
+
+def _encode_labels(trials: pd.DataFrame) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray], pd.Index]:
+    """Integer-code all label columns against one shared vocabulary.
+
+    The vocabulary starts with LABELS, so codes 0-2 are poor/standard/good;
+    -1 marks a missing value. Normalized codes (strip + lower) are derived
+    from the vocabulary, not from the rows.
+    """
+    # factorize each column once; only the few distinct values are then
+    # matched against the vocabulary
+    factorized = {col: pd.factorize(trials[col]) for col in LABEL_COLUMNS}
+    uniques = pd.unique(np.concatenate([
+        np.asarray(col_uniques, dtype=object) for _, col_uniques in factorized.values()
+    ]))
+    vocabulary = pd.Index(LABELS).append(pd.Index(uniques).difference(LABELS, sort=False))
+
+    raw_codes = {
+        col: np.append(vocabulary.get_indexer(col_uniques), -1)[codes]
+        for col, (codes, col_uniques) in factorized.items()
+    }
+
+    normalized = pd.Series(vocabulary.astype(str)).str.strip().str.lower()
+    normalized_vocabulary, normalized_map = np.unique(normalized.to_numpy(dtype=object), return_inverse=True)
+    normalized_map = np.append(normalized_map, -1)
+
+    normalized_codes = {
+        col: normalized_map[raw_codes[col]]
+        for col in LABEL_COLUMNS
+    }
+
+    return raw_codes, normalized_codes, pd.Index(normalized_vocabulary)
+
+
+def _is_label(codes: np.ndarray) -> np.ndarray:
+    return (codes >= 0) & (codes < len(LABELS))
+
+
+def _equal(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a == b) & (a >= 0)
+
+
+def _in_set(codes: np.ndarray, set_mask: np.ndarray) -> np.ndarray:
+    shift = np.where(_is_label(codes), codes, 0)
+    return _is_label(codes) & (((set_mask >> shift) & 1) == 1)
+
+
+def _pos_in_set(decision: np.ndarray, elements: list[np.ndarray], mask_set: np.ndarray) -> np.ndarray:
+    pos = np.select(
+        [_equal(decision, element) for element in elements],
+        [1, 2, 3],
+        default=-1,
+    )
+    out = np.full(len(decision), pd.NA, dtype=object)
+    out[mask_set] = pos[mask_set]
+    return out
+
+
+def construct_trial_level_variables_coded(trials: pd.DataFrame) -> pd.DataFrame:
+    trials = trials.copy(deep=False)
+
+    mask_pp = trials["condition"].isin(["C1", "C2"]).to_numpy()
+    mask_set = trials["condition"].eq("C3").to_numpy(dtype=bool, na_value=False)
+    if not (mask_pp | mask_set).all():
+        raise ValueError("Every trial needs a condition in C1, C2 or C3")
+
+    raw, norm, normalized_vocabulary = _encode_labels(trials)
+
+    contains = trials[CP_CONTAINS_COLUMNS].to_numpy(dtype=float)
+    if np.isnan(contains).any():
+        raise ValueError("cp_contains_* columns must not contain missing values")
+    set_mask = ((contains != 0).astype(np.int64) << np.arange(len(LABELS))).sum(axis=1)
+
+    y = raw["y_true"]
+    y_is_label = _is_label(y)
+
+    # human correctness
+    initial_correct = y_is_label & _equal(y, raw["initial_decision"])
+    final_correct = y_is_label & _equal(y, raw["final_decision"])
+
+    # AI correctness
+    point_pred_correct = _equal(y, raw["point_pred_cal"])
+    set_based_correct = _in_set(y, set_mask)
+    ai_correct = np.where(mask_pp, point_pred_correct, set_based_correct)
+    top1_correct = np.where(mask_pp, ai_correct, _equal(raw["cp_set_el1"], y))
+
+    # human-AI agreement
+    initial_agree_ai = np.where(
+        mask_pp,
+        _equal(raw["initial_decision"], raw["point_pred_cal"]),
+        _in_set(raw["initial_decision"], set_mask),
+    )
+    final_agree_ai = np.where(
+        mask_pp,
+        _equal(raw["final_decision"], raw["point_pred_cal"]),
+        _in_set(raw["final_decision"], set_mask),
+    )
+    initial_top_1_agree = np.where(
+        mask_pp,
+        initial_agree_ai,
+        _equal(raw["initial_decision"], raw["cp_set_el1"]),
+    )
+
+    trials["initial_correct"] = initial_correct.astype(int)
+    trials["final_correct"] = final_correct.astype(int)
+    trials["point_pred_correct"] = point_pred_correct.astype(int)
+    trials["set_based_correct"] = set_based_correct.astype(int)
+    trials["ai_correct"] = ai_correct.astype(int)
+    trials["top1_correct"] = top1_correct.astype(int)
+    trials["initial_agree_ai"] = initial_agree_ai.astype(int)
+    trials["final_agree_ai"] = final_agree_ai.astype(int)
+    trials["initial_top_1_agree"] = initial_top_1_agree.astype(int)
+
+    elements = [norm["cp_set_el1"], norm["cp_set_el2"], norm["cp_set_el3"]]
+    trials["initial_pos_in_set"] = _pos_in_set(norm["initial_decision"], elements, mask_set)
+    trials["final_pos_in_set"] = _pos_in_set(norm["final_decision"], elements, mask_set)
+
+    for col in NORMALIZED_COLUMNS:
+        trials[col] = pd.Series(
+            normalized_vocabulary.take(norm[col], allow_fill=True, fill_value=np.nan),
+            index=trials.index,
+            dtype="str",
+        )
+
+    # set size and shared AI confidence
+    set_size = contains.astype(int).sum(axis=1)
+    trials["set_size"] = set_size
+
+    if not ((set_size[mask_set] >= 1) & (set_size[mask_set] <= 3)).all():
+        raise ValueError("C3 trials need a conformal set of size 1 to 3")
+
+    conf = trials["point_pred_confidence"].to_numpy(dtype=float)
+    pp_confidence = np.select(
+        [conf > 0.84, (conf >= 0.625) & (conf <= 0.84), conf < 0.625],
+        [3, 2, 1],
+        default=0,
+    )
+    shared_ai_confidence = np.where(mask_pp, pp_confidence, 4 - set_size)
+    trials["shared_ai_confidence"] = shared_ai_confidence.astype(int)
+
+    # confidence gap
+    trials["initial_confidence_norm"] = (trials["initial_confidence"] - 1) / 4
+    trials["shared_ai_norm"] = (trials["shared_ai_confidence"] - 1) / 2
+    trials["confidence_gap"] = trials["shared_ai_norm"] - trials["initial_confidence_norm"]
+
+    # switching: missing decisions never compare equal
+    initial, final = norm["initial_decision"], norm["final_decision"]
+    trials["switched"] = ((initial != final) | (initial < 0)).astype(int)
+
+    # reliance
+    trials["over_reliance"] = (final_agree_ai & ~ai_correct).astype(int)
+    trials["under_reliance"] = (~final_agree_ai & ai_correct).astype(int)
+    trials["appropriate_reliance"] = (final_agree_ai == ai_correct).astype(int)
+
+    return trials
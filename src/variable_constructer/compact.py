@@ -0,0 +1,51 @@
+import pandas as pd
+
+from .construct_variables import BINARY_COLUMNS
+from .labels import LABEL_COLUMNS, LABELS
+
+CATEGORICAL_COLUMNS = {
+    "condition": ["C1", "C2", "C3"],
+    **{col: LABELS for col in LABEL_COLUMNS},
+    "point_predict_conf_bin": ["low_confidence", "medium_confidence", "high_confidence"],
+}
+
+SMALL_INT_COLUMNS = {
+    "trial_index": "int8",
+    "set_size": "int8",
+    "shared_ai_confidence": "int8",
+    "initial_pos_in_set": "Int8",
+    "final_pos_in_set": "Int8",
+}
+
+
+def compact_trial_table(trials: pd.DataFrame) -> pd.DataFrame:
+    """Return the trial table with fixed-order categoricals for label columns
+    and int8 for binary flags and small integer codes."""
+    trials = trials.copy(deep=False)
+
+    for col, categories in CATEGORICAL_COLUMNS.items():
+        if col in trials.columns:
+            trials[col] = pd.Categorical(trials[col], categories=categories)
+
+    if "participant_code" in trials.columns:
+        trials["participant_code"] = trials["participant_code"].astype("category")
+
+    binary_cols = [c for c in BINARY_COLUMNS if c in trials.columns]
+    trials[binary_cols] = trials[binary_cols].astype("int8")
+
+    for col, dtype in SMALL_INT_COLUMNS.items():
+        if col in trials.columns:
+            trials[col] = pd.to_numeric(trials[col]).astype(dtype)
+
+    return trials
+
+
+def memory_report(original: pd.DataFrame, compact: pd.DataFrame) -> pd.DataFrame:
+    report = pd.DataFrame({
+        "original_bytes": original.memory_usage(deep=True, index=False),
+        "compact_bytes": compact.memory_usage(deep=True, index=False),
+    })
+    report.loc["total"] = report.sum()
+    report["reduction"] = 1 - report["compact_bytes"] / report["original_bytes"]
+
+    return report
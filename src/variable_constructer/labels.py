@@ -0,0 +1,26 @@
+# label vocabulary and the trial columns holding labels, shared by the
+# registry, the coded engine and the compact table
+
+LABELS = ["poor", "standard", "good"]
+
+LABEL_COLUMNS = [
+    "y_true",
+    "initial_decision",
+    "final_decision",
+    "point_pred_cal",
+    "cp_set_el1",
+    "cp_set_el2",
+    "cp_set_el3",
+]
+
+# label columns returned stripped and lower-cased
+NORMALIZED_COLUMNS = [
+    "initial_decision",
+    "final_decision",
+    "cp_set_el1",
+    "cp_set_el2",
+    "cp_set_el3",
+]
+
+# conformal-set membership flags, in LABELS order
+CP_CONTAINS_COLUMNS = [f"cp_contains_{label}" for label in LABELS]
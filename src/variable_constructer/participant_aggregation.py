@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+PARTICIPANT_STATS_METRICS = {
+    "mean_page_duration_stage1": ("page_duration_stage1", "mean"),
+    "mean_page_duration_stage2": ("page_duration_stage2", "mean"),
+    "condition": ("condition", "first"),
+}
+
+PARTICIPANT_OUTCOME_METRICS = {
+    "condition": ("condition", "first"),
+    "n_trials": ("trial_index", "count"),
+    "initial_accuracy": ("initial_correct", "mean"),
+    "final_accuracy": ("final_correct", "mean"),
+    "switch_rate": ("switched", "mean"),
+    "n_switches": ("switched", "sum"),
+    "final_agree_ai_rate": ("final_agree_ai", "mean"),
+    "over_reliance_rate": ("over_reliance", "mean"),
+    "under_reliance_rate": ("under_reliance", "mean"),
+    "appropriate_reliance_rate": ("appropriate_reliance", "mean"),
+    "mean_initial_confidence": ("initial_confidence", "mean"),
+    "mean_final_confidence": ("final_confidence", "mean"),
+}
+
+AGGREGATIONS = {"mean", "sum", "count", "min", "max", "first", "last"}
+
+
+def _group_runs(group: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stable order of rows by participant, plus start/end of each run."""
+    order = np.argsort(group, kind="stable")
+    sorted_group = group[order]
+    boundaries = np.flatnonzero(sorted_group[1:] != sorted_group[:-1]) + 1
+    starts = np.r_[0, boundaries] if len(order) else boundaries
+    ends = np.r_[boundaries - 1, len(order) - 1] if len(order) else boundaries
+
+    return order, starts, ends
+
+
+def _aggregate(codes: np.ndarray, n_groups: int, values: pd.Series, how: str) -> np.ndarray:
+    valid = values.notna().to_numpy() & (codes >= 0)
+    group = codes[valid]
+
+    if how == "count":
+        return np.bincount(group, minlength=n_groups)
+
+    if how in ("mean", "sum"):
+        numeric = values.to_numpy(dtype=float, na_value=np.nan)[valid]
+        sums = np.bincount(group, weights=numeric, minlength=n_groups)
+        if how == "sum":
+            return sums
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / np.bincount(group, minlength=n_groups)
+
+    order, starts, ends = _group_runs(group)
+    present = group[order][starts]
+
+    if how in ("first", "last"):
+        rows = np.flatnonzero(valid)[order][starts if how == "first" else ends]
+        result = np.full(n_groups, np.nan, dtype=object)
+        result[present] = values.to_numpy(dtype=object)[rows]
+        return result
+
+    numeric = values.to_numpy(dtype=float, na_value=np.nan)[valid]
+    reduce = np.minimum if how == "min" else np.maximum
+    result = np.full(n_groups, np.nan)
+    if len(order):
+        result[present] = reduce.reduceat(numeric[order], starts)
+    return result
+
+
+def aggregate_participants(
+    trials: pd.DataFrame,
+    metrics: dict[str, tuple[str, str]],
+    by: str = "participant_code",
+) -> pd.DataFrame:
+    """Per-participant metrics computed from one factorization of `by`.
+
+    `metrics` maps output names to (trial column, aggregation) with the
+    aggregation one of mean, sum, count, min, max, first or last; missing
+    values are skipped as in a pandas groupby.
+    """
+    unknown = {how for _, how in metrics.values()} - AGGREGATIONS
+    if unknown:
+        raise ValueError(f"Unknown aggregations {sorted(unknown)}, expected one of {sorted(AGGREGATIONS)}")
+
+    codes, participants = pd.factorize(trials[by], sort=True)
+    n_groups = len(participants)
+
+    out = pd.DataFrame({by: participants})
+    for name, (column, how) in metrics.items():
+        values = _aggregate(codes, n_groups, trials[column], how)
+        if how in ("first", "last"):
+            values = pd.Series(values).infer_objects().astype(trials[column].dtype, errors="ignore")
+        out[name] = values
+
+    return out
@@ -0,0 +1,235 @@
+import operator
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from .labels import CP_CONTAINS_COLUMNS, LABELS, NORMALIZED_COLUMNS
+
+
+@dataclass(frozen=True)
+class DerivedVariable:
+    name: str
+    inputs: tuple[str, ...]
+    compute: Callable[..., pd.Series]
+
+
+DERIVED_VARIABLES: dict[str, DerivedVariable] = {}
+
+
+def derived_variable(name: str, inputs: Iterable[str]):
+    """Register `func(*inputs) -> Series` as the definition of `name`."""
+    def register(func):
+        DERIVED_VARIABLES[name] = DerivedVariable(name, tuple(inputs), func)
+        return func
+
+    return register
+
+
+class LazyTrials:
+    """Trial table whose derived columns are computed on first access.
+
+    Each derived variable is computed at most once; its inputs are resolved
+    recursively through the registry, so only the dependency closure of the
+    requested columns is ever evaluated.
+    """
+
+    def __init__(self, trials: pd.DataFrame):
+        self.trials = trials
+        self._computed: dict[str, pd.Series] = {}
+
+    def __getitem__(self, name: str) -> pd.Series:
+        if name in self._computed:
+            return self._computed[name]
+        if name in self.trials.columns and name not in DERIVED_VARIABLES:
+            return self.trials[name]
+        if name not in DERIVED_VARIABLES:
+            raise KeyError(f"{name!r} is neither a trial column nor a registered derived variable")
+
+        variable = DERIVED_VARIABLES[name]
+        values = variable.compute(*(self[dependency] for dependency in variable.inputs))
+        self._computed[name] = pd.Series(values, index=self.trials.index, name=name)
+
+        return self._computed[name]
+
+    def to_frame(self, columns: Iterable[str]) -> pd.DataFrame:
+        # every name is looked up, so unknown ones raise as in __getitem__
+        values = {name: self[name] for name in columns}
+        return self.trials.assign(**{name: values[name] for name in values if name in DERIVED_VARIABLES})
+
+
+def resolve_dependencies(columns: Iterable[str]) -> list[str]:
+    """Derived variables needed for `columns`, in evaluation order."""
+    order: list[str] = []
+
+    def visit(name: str, path: tuple[str, ...]) -> None:
+        if name not in DERIVED_VARIABLES or name in order:
+            return
+        if name in path:
+            raise ValueError(f"Cyclic derived variables: {' -> '.join(path + (name,))}")
+        for dependency in DERIVED_VARIABLES[name].inputs:
+            visit(dependency, path + (name,))
+        order.append(name)
+
+    for column in columns:
+        visit(column, ())
+
+    return order
+
+
+def compute_variables(trials: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """Return `trials` with only the requested derived columns added."""
+    return LazyTrials(trials).to_frame(columns)
+
+
+def _contains(labels: pd.Series, *contains: pd.Series) -> pd.Series:
+    """Whether each label is in the set flagged by the CP_CONTAINS_COLUMNS."""
+    return reduce(operator.or_, (labels.eq(label) & flags for label, flags in zip(LABELS, contains)))
+
+
+def _normalize(labels: pd.Series) -> pd.Series:
+    return labels.astype(str).str.strip().str.lower()
+
+
+def _position(decision: pd.Series, el1: pd.Series, el2: pd.Series, el3: pd.Series, mask_set: pd.Series) -> pd.Series:
+    position = np.select([decision.eq(el1), decision.eq(el2), decision.eq(el3)], [1, 2, 3], default=-1)
+    return pd.Series(position, index=decision.index).astype(object).where(mask_set, pd.NA)
+
+
+# condition masks
+derived_variable("_mask_pp", ["condition"])(lambda condition: condition.isin(["C1", "C2"]))
+derived_variable("_mask_set", ["condition"])(lambda condition: condition == "C3")
+
+# labels after strip/lower, used for position-in-set and switching
+for _col in NORMALIZED_COLUMNS:
+    derived_variable(f"_{_col}_norm", [_col])(_normalize)
+
+
+# human correctness
+@derived_variable("initial_correct", ["y_true", "initial_decision"])
+def _initial_correct(y_true, initial_decision):
+    return (y_true.isin(LABELS) & y_true.eq(initial_decision)).astype(int)
+
+
+@derived_variable("final_correct", ["y_true", "final_decision"])
+def _final_correct(y_true, final_decision):
+    return (y_true.isin(LABELS) & y_true.eq(final_decision)).astype(int)
+
+
+# AI correctness
+@derived_variable("point_pred_correct", ["point_pred_cal", "y_true"])
+def _point_pred_correct(point_pred_cal, y_true):
+    return point_pred_cal.eq(y_true).astype(int)
+
+
+@derived_variable("set_based_correct", ["y_true", *CP_CONTAINS_COLUMNS])
+def _set_based_correct(y_true, poor, standard, good):
+    return _contains(y_true, poor, standard, good).astype(int)
+
+
+@derived_variable("ai_correct", ["_mask_pp", "point_pred_correct", "set_based_correct"])
+def _ai_correct(mask_pp, point_pred_correct, set_based_correct):
+    return np.where(mask_pp, point_pred_correct, set_based_correct)
+
+
+@derived_variable("top1_correct", ["_mask_pp", "ai_correct", "cp_set_el1", "y_true"])
+def _top1_correct(mask_pp, ai_correct, cp_set_el1, y_true):
+    return np.where(mask_pp, ai_correct, cp_set_el1.eq(y_true)).astype(int)
+
+
+# human-AI agreement
+@derived_variable("initial_agree_ai", ["_mask_pp", "initial_decision", "point_pred_cal", *CP_CONTAINS_COLUMNS])
+def _initial_agree_ai(mask_pp, initial_decision, point_pred_cal, poor, standard, good):
+    return np.where(
+        mask_pp,
+        initial_decision.eq(point_pred_cal),
+        _contains(initial_decision, poor, standard, good),
+    ).astype(int)
+
+
+@derived_variable("final_agree_ai", ["_mask_pp", "final_decision", "point_pred_cal", *CP_CONTAINS_COLUMNS])
+def _final_agree_ai(mask_pp, final_decision, point_pred_cal, poor, standard, good):
+    return np.where(
+        mask_pp,
+        final_decision.eq(point_pred_cal),
+        _contains(final_decision, poor, standard, good),
+    ).astype(int)
+
+
+@derived_variable("initial_top_1_agree", ["_mask_pp", "initial_agree_ai", "initial_decision", "cp_set_el1"])
+def _initial_top_1_agree(mask_pp, initial_agree_ai, initial_decision, cp_set_el1):
+    return np.where(mask_pp, initial_agree_ai, initial_decision.eq(cp_set_el1)).astype(int)
+
+
+@derived_variable("initial_pos_in_set", [
+    "_initial_decision_norm", "_cp_set_el1_norm", "_cp_set_el2_norm", "_cp_set_el3_norm", "_mask_set",
+])
+def _initial_pos_in_set(decision, el1, el2, el3, mask_set):
+    return _position(decision, el1, el2, el3, mask_set)
+
+
+@derived_variable("final_pos_in_set", [
+    "_final_decision_norm", "_cp_set_el1_norm", "_cp_set_el2_norm", "_cp_set_el3_norm", "_mask_set",
+])
+def _final_pos_in_set(decision, el1, el2, el3, mask_set):
+    return _position(decision, el1, el2, el3, mask_set)
+
+
+# set size and shared AI confidence
+@derived_variable("set_size", CP_CONTAINS_COLUMNS)
+def _set_size(poor, standard, good):
+    return poor.astype(int) + standard.astype(int) + good.astype(int)
+
+
+@derived_variable("shared_ai_confidence", ["_mask_pp", "point_pred_confidence", "set_size"])
+def _shared_ai_confidence(mask_pp, conf, set_size):
+    pp_confidence = np.select(
+        [conf > 0.84, (conf >= 0.625) & (conf <= 0.84), conf < 0.625],
+        [3, 2, 1],
+        default=0,
+    )
+    return np.where(mask_pp, pp_confidence, set_size.map({1: 3, 2: 2, 3: 1})).astype(int)
+
+
+# confidence gap
+@derived_variable("initial_confidence_norm", ["initial_confidence"])
+def _initial_confidence_norm(initial_confidence):
+    return pd.to_numeric((initial_confidence - 1) / 4, errors="coerce")
+
+
+@derived_variable("shared_ai_norm", ["shared_ai_confidence"])
+def _shared_ai_norm(shared_ai_confidence):
+    return pd.to_numeric((shared_ai_confidence - 1) / 2, errors="coerce")
+
+
+@derived_variable("confidence_gap", ["shared_ai_norm", "initial_confidence_norm"])
+def _confidence_gap(shared_ai_norm, initial_confidence_norm):
+    return shared_ai_norm - initial_confidence_norm
+
+
+# switching
+@derived_variable("switched", ["_initial_decision_norm", "_final_decision_norm"])
+def _switched(initial_decision, final_decision):
+    return (initial_decision != final_decision).astype(int)
+
+
+# reliance
+@derived_variable("over_reliance", ["final_agree_ai", "ai_correct"])
+def _over_reliance(final_agree_ai, ai_correct):
+    return ((final_agree_ai == 1) & (ai_correct == 0)).astype(int)
+
+
+@derived_variable("under_reliance", ["final_agree_ai", "ai_correct"])
+def _under_reliance(final_agree_ai, ai_correct):
+    return ((final_agree_ai == 0) & (ai_correct == 1)).astype(int)
+
+
+@derived_variable("appropriate_reliance", ["final_agree_ai", "ai_correct"])
+def _appropriate_reliance(final_agree_ai, ai_correct):
+    return (final_agree_ai.astype(bool) == ai_correct.astype(bool)).astype(int)
+
+
+# every public derived variable, in registration order
+ALL_DERIVED = tuple(name for name in DERIVED_VARIABLES if not name.startswith("_"))